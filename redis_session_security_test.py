@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Redis Session Store Test Script for RBAC System
+
+This script tests RedisSessionSecurityManager against an in-memory client
+passed in through redis_client=, so no Redis server is needed:
+1. Session creation and key expiry
+2. Session validation against the live user profile
+3. Hijack detection
+4. Logout and logout of all user sessions
+5. Pruning of expired tokens from a user's session set
+6. Session expiry
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from session_security import RedisSessionSecurityManager
+
+CHROME_UA = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0 Safari/537.36'
+FIREFOX_UA = 'Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0'
+
+class FakeRedis:
+    """
+    In-memory stand-in for the subset of redis.Redis the session store uses.
+    
+    Keys expire at their pexpireat timestamp, measured against a clock that
+    tests can move forward with advance().
+    """
+    
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+        self.expiry: Dict[str, int] = {}
+        self.offset_ms = 0
+    
+    def advance(self, seconds: float):
+        """Move the clock forward"""
+        self.offset_ms += int(seconds * 1000)
+    
+    def now_ms(self) -> int:
+        return int(time.time() * 1000) + self.offset_ms
+    
+    def _live(self, key: str) -> Optional[Any]:
+        """Return a key's value, dropping it first if it has expired"""
+        if key in self.expiry and self.expiry[key] <= self.now_ms():
+            self.data.pop(key, None)
+            del self.expiry[key]
+        return self.data.get(key)
+    
+    def pipeline(self, transaction: bool = True) -> 'FakePipeline':
+        return FakePipeline(self)
+    
+    def hset(self, key: str, field: Optional[str] = None, value: Any = None,
+             mapping: Optional[Dict[str, Any]] = None) -> int:
+        values = self._live(key)
+        if values is None:
+            values = self.data[key] = {}
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        added = len(set(items) - set(values))
+        values.update({name: str(item) for name, item in items.items()})
+        return added
+    
+    def hget(self, key: str, field: str) -> Optional[str]:
+        return (self._live(key) or {}).get(field)
+    
+    def hmget(self, key: str, *fields: str) -> List[Optional[str]]:
+        values = self._live(key) or {}
+        return [values.get(field) for field in fields]
+    
+    def hgetall(self, key: str) -> Dict[str, str]:
+        return dict(self._live(key) or {})
+    
+    def pexpireat(self, key: str, when: int) -> bool:
+        if self._live(key) is None:
+            return False
+        if when <= self.now_ms():
+            self.delete(key)
+        else:
+            self.expiry[key] = when
+        return True
+    
+    def sadd(self, key: str, *members: str) -> int:
+        values = self._live(key)
+        if values is None:
+            values = self.data[key] = set()
+        added = len(set(members) - values)
+        values.update(members)
+        return added
+    
+    def srem(self, key: str, *members: str) -> int:
+        values = self._live(key) or set()
+        removed = len(values & set(members))
+        values.difference_update(members)
+        return removed
+    
+    def smembers(self, key: str) -> Set[str]:
+        return set(self._live(key) or set())
+    
+    def delete(self, *keys: str) -> int:
+        deleted = 0
+        for key in keys:
+            if self._live(key) is not None:
+                del self.data[key]
+                self.expiry.pop(key, None)
+                deleted += 1
+        return deleted
+
+class FakePipeline:
+    """Queues FakeRedis commands and runs them on execute()"""
+    
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self.commands: List[Any] = []
+    
+    def __getattr__(self, name: str):
+        method = getattr(self.client, name)
+        
+        def queue(*args, **kwargs):
+            self.commands.append((method, args, kwargs))
+            return self
+        
+        return queue
+    
+    def execute(self) -> List[Any]:
+        results = [method(*args, **kwargs) for method, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+class RedisSessionSecurityTester:
+    """Test suite for the Redis-backed session store"""
+    
+    def __init__(self):
+        """Initialize the tester with a fresh database and fake Redis client"""
+        fd, self.database_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        
+        self.redis = FakeRedis()
+        self.manager = RedisSessionSecurityManager(
+            self.database_path, session_timeout=3600, redis_client=self.redis
+        )
+        
+        # The manager seeds an active admin with id 1
+        self.user_id = 1
+        self.ip = '203.0.113.10'
+        
+        self.test_results = []
+    
+    def print_header(self, title: str):
+        """Print a formatted test section header"""
+        print(f"\n{'='*80}")
+        print(f"📋 {title}")
+        print(f"{'='*80}")
+    
+    def print_test(self, test_name: str, success: bool, details: str = ""):
+        """Print test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status} {test_name}")
+        if details:
+            print(f"   📋 Details: {details}")
+        
+        self.test_results.append({
+            'test': test_name,
+            'success': success,
+            'details': details
+        })
+    
+    def set_user(self, **columns: Any):
+        """Update the test user's row directly, as another service would"""
+        assignments = ', '.join(f"{column} = ?" for column in columns)
+        conn = sqlite3.connect(self.database_path)
+        with conn:
+            conn.execute(f"UPDATE users SET {assignments} WHERE id = ?",
+                         (*columns.values(), self.user_id))
+        conn.close()
+    
+    def validate(self, token: str, ua: str = CHROME_UA) -> Optional[Dict[str, Any]]:
+        """Validate a token from the test client"""
+        return self.manager.validate_session(token, self.ip, ua)
+    
+    def test_create_session(self):
+        """Test that sessions are stored with an absolute expiry"""
+        self.print_header("Session Creation")
+        
+        token = self.manager.create_session(self.user_id, self.ip, CHROME_UA)
+        key = f'session:{token}'
+        session = self.redis.hgetall(key)
+        
+        self.print_test(
+            "Session hash stored",
+            session.get('user_id') == str(self.user_id) and session.get('ip_address') == self.ip
+        )
+        self.print_test(
+            "Session key expires with the session",
+            self.redis.expiry.get(key) == int(session.get('expires_at', 0))
+        )
+        self.print_test(
+            "Token added to the user's session set",
+            token in self.redis.smembers(f'user_sessions:{self.user_id}')
+        )
+        self.print_test(
+            "Profile is not copied into the session",
+            'status' not in session and 'role' not in session
+        )
+    
+    def test_validate_session(self):
+        """Test validation, including the absolute expiry being kept"""
+        self.print_header("Session Validation")
+        
+        token = self.manager.create_session(self.user_id, self.ip, CHROME_UA)
+        key = f'session:{token}'
+        expires_at = self.redis.expiry[key]
+        
+        session = self.validate(token)
+        self.print_test(
+            "Valid session accepted",
+            session is not None and session['user_id'] == self.user_id
+            and session['email'] == 'test@example.com' and session['role'] == 'admin'
+        )
+        self.print_test(
+            "Validation keeps the original expiry",
+            self.redis.expiry.get(key) == expires_at
+        )
+        self.print_test("Unknown token rejected", self.validate('0' * 64) is None)
+        self.print_test("Empty token rejected", self.validate('') is None)
+    
+    def test_live_user_profile(self):
+        """Test that account changes after login apply to existing sessions"""
+        self.print_header("Live User Profile")
+        
+        token = self.manager.create_session(self.user_id, self.ip, CHROME_UA)
+        
+        self.set_user(role='employee')
+        session = self.validate(token)
+        self.print_test(
+            "Role change applies to an existing session",
+            session is not None and session['role'] == 'employee',
+            f"role: {session and session['role']}"
+        )
+        
+        self.set_user(status='inactive')
+        self.print_test("Deactivated user rejected", self.validate(token) is None)
+        self.print_test(
+            "Deactivated user's session removed",
+            not self.redis.hgetall(f'session:{token}')
+        )
+        
+        self.set_user(role='admin', status='active')
+    
+    def test_hijack_detection(self):
+        """Test that a different browser invalidates the session"""
+        self.print_header("Hijack Detection")
+        
+        token = self.manager.create_session(self.user_id, self.ip, CHROME_UA)
+        
+        self.print_test("Different user agent rejected", self.validate(token, FIREFOX_UA) is None)
+        self.print_test(
+            "Hijacked session removed",
+            self.validate(token) is None and not self.redis.hgetall(f'session:{token}')
+        )
+    
+    def test_logout(self):
+        """Test logging out a single session"""
+        self.print_header("Logout")
+        
+        token = self.manager.create_session(self.user_id, self.ip, CHROME_UA)
+        
+        self.print_test("Logout succeeds", self.manager.logout_session(token, self.ip, CHROME_UA))
+        self.print_test("Logged-out session rejected", self.validate(token) is None)
+        self.print_test(
+            "Token removed from the user's session set",
+            token not in self.redis.smembers(f'user_sessions:{self.user_id}')
+        )
+        self.print_test(
+            "Second logout reports failure",
+            not self.manager.logout_session(token, self.ip, CHROME_UA)
+        )
+    
+    def test_logout_all(self):
+        """Test logging out every session of a user"""
+        self.print_header("Logout All Sessions")
+        
+        tokens = [self.manager.create_session(self.user_id, self.ip, CHROME_UA) for _ in range(3)]
+        self.manager.logout_all_user_sessions(self.user_id, 'test')
+        
+        self.print_test(
+            "All sessions rejected",
+            all(self.validate(token) is None for token in tokens)
+        )
+        self.print_test(
+            "User's session set emptied",
+            not self.redis.smembers(f'user_sessions:{self.user_id}')
+        )
+        
+        logged = {
+            event['session_token']
+            for event in self.manager.get_security_events(user_id=self.user_id)
+            if event['event_type'] == 'logout_all'
+        }
+        self.print_test("Logout recorded for each session", set(tokens) <= logged)
+    
+    def test_get_user_sessions(self):
+        """Test listing sessions and pruning expired tokens"""
+        self.print_header("User Session Listing")
+        
+        self.manager.logout_all_user_sessions(self.user_id)
+        live = self.manager.create_session(self.user_id, self.ip, CHROME_UA)
+        gone = self.manager.create_session(self.user_id, self.ip, CHROME_UA)
+        
+        # Expire one session's hash while its token stays in the user's set
+        self.redis.delete(f'session:{gone}')
+        
+        sessions = self.manager.get_user_sessions(self.user_id)
+        self.print_test(
+            "Only live sessions listed",
+            [session['session_token'] for session in sessions] == [live]
+        )
+        self.print_test(
+            "Expired token pruned from the user's session set",
+            self.redis.smembers(f'user_sessions:{self.user_id}') == {live}
+        )
+    
+    def test_session_expiry(self):
+        """Test that sessions stop validating once their timeout passes"""
+        self.print_header("Session Expiry")
+        
+        token = self.manager.create_session(self.user_id, self.ip, CHROME_UA)
+        self.redis.advance(3601)
+        
+        self.print_test("Expired session rejected", self.validate(token) is None)
+        self.print_test(
+            "Expired token pruned on listing",
+            token not in {session['session_token'] for session in self.manager.get_user_sessions(self.user_id)}
+            and token not in self.redis.smembers(f'user_sessions:{self.user_id}')
+        )
+        
+        self.redis.offset_ms = 0
+    
+    def test_expiry_during_validation(self):
+        """Test that a session expiring mid-validation does not come back"""
+        self.print_header("Expiry During Validation")
+        
+        token = self.manager.create_session(self.user_id, self.ip, CHROME_UA)
+        key = f'session:{token}'
+        hgetall = self.redis.hgetall
+        
+        # Let the key expire right after validation has read it, so the
+        # last-activity write recreates it without a TTL
+        def read_then_expire(name: str) -> Dict[str, str]:
+            values = hgetall(name)
+            self.redis.advance(3601)
+            return values
+        
+        self.redis.hgetall = read_then_expire
+        try:
+            self.validate(token)
+        finally:
+            self.redis.hgetall = hgetall
+        
+        self.print_test("Recreated session key removed again", key not in self.redis.data)
+        
+        self.redis.offset_ms = 0
+    
+    def run_all_tests(self):
+        """Run all Redis session store tests"""
+        print("🚀 Starting Redis Session Store Test Suite")
+        
+        start_time = time.time()
+        
+        try:
+            self.test_create_session()
+            self.test_validate_session()
+            self.test_live_user_profile()
+            self.test_hijack_detection()
+            self.test_logout()
+            self.test_logout_all()
+            self.test_get_user_sessions()
+            self.test_session_expiry()
+            self.test_expiry_during_validation()
+        finally:
+            self.manager.close()
+            os.unlink(self.database_path)
+        
+        # Print summary
+        duration = time.time() - start_time
+        
+        total_tests = len(self.test_results)
+        passed_tests = len([r for r in self.test_results if r['success']])
+        failed_tests = total_tests - passed_tests
+        
+        self.print_header("Test Summary")
+        print(f"📊 Total Tests: {total_tests}")
+        print(f"✅ Passed: {passed_tests}")
+        print(f"❌ Failed: {failed_tests}")
+        print(f"⏱️  Duration: {duration:.2f} seconds")
+        
+        if failed_tests == 0:
+            print("\n🎉 All Redis session store tests passed!")
+        else:
+            print(f"\n⚠️  {failed_tests} test(s) failed. Review the Redis session store.")
+        
+        return failed_tests == 0
+
+def main():
+    """Main function to run Redis session store tests"""
+    print("🔐 RBAC System - Redis Session Store Test Suite")
+    print("=" * 55)
+    
+    tester = RedisSessionSecurityTester()
+    success = tester.run_all_tests()
+    
+    if success:
+        exit(0)
+    else:
+        exit(1)
+
+if __name__ == "__main__":
+    main()
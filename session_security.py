@@ -7,14 +7,22 @@ This module implements comprehensive session security including:
 - Proper session lifecycle management
 - Session token generation and validation
 - Logout security measures
+- Optional Redis-backed session store for multi-process deployments
+
+The module is fully type-annotated and free of dynamic tricks, so hot paths
+such as validate_session can be compiled to a C extension with mypyc
+(`mypyc session_security.py`) where interpreter overhead matters.
 """
 
 import secrets
 import hashlib
 import time
 import json
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from datetime import timedelta
+from typing import Optional, Dict, Any, List, Tuple
 import sqlite3
 import logging
 
@@ -22,6 +30,92 @@ import logging
 session_logger = logging.getLogger('session_security')
 session_logger.setLevel(logging.INFO)
 
+# Shared by every security log write so SQLite's statement cache always sees
+# the same SQL text
+_INSERT_LOG_SQL = '''
+    INSERT INTO session_security_log 
+    (session_token, user_id, event_type, ip_address, user_agent, details, risk_level)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Profile columns RedisSessionSecurityManager reads on every validation
+_USER_PROFILE_SQL = 'SELECT email, role, first_name, last_name, status FROM users WHERE id = ?'
+
+# Browser and OS families in fingerprint order
+_UA_BROWSERS = ('unknown', 'chrome', 'firefox', 'safari', 'edge')
+_UA_OSES = ('unknown', 'windows', 'macos', 'linux', 'android', 'ios')
+
+def _extract_browser_os(ua: str) -> Tuple[str, str]:
+    """Extract coarse browser and OS families from a user agent string"""
+    # Lowercase once; each keyword test below is then a C-level substring
+    # search, which beats a regex scan over the whole string
+    ua_lower = ua.lower()
+    browser = 'unknown'
+    os = 'unknown'
+    
+    # Detect browser
+    if 'chrome' in ua_lower and 'edg' not in ua_lower:
+        browser = 'chrome'
+    elif 'firefox' in ua_lower:
+        browser = 'firefox'
+    elif 'safari' in ua_lower and 'chrome' not in ua_lower:
+        browser = 'safari'
+    elif 'edg' in ua_lower:
+        browser = 'edge'
+    
+    # Detect OS
+    if 'windows' in ua_lower:
+        os = 'windows'
+    elif 'mac' in ua_lower:
+        os = 'macos'
+    elif 'linux' in ua_lower:
+        os = 'linux'
+    elif 'android' in ua_lower:
+        os = 'android'
+    elif 'ios' in ua_lower:
+        os = 'ios'
+    
+    return browser, os
+
+@lru_cache(maxsize=1024)
+def _ua_fingerprint(ua: str) -> int:
+    """
+    Pack the browser and OS family of a user agent into one integer.
+    
+    Two user agents are treated as the same client when their fingerprints
+    are equal. Results are memoized since the same few user agents are
+    validated on every request.
+    """
+    browser, os = _extract_browser_os(ua)
+    return _UA_BROWSERS.index(browser) << 8 | _UA_OSES.index(os)
+
+def _token_hash(session_token: str) -> int:
+    """
+    Hash a session token to a signed 64-bit integer for index lookups.
+    
+    Index comparisons on the integer are cheaper than on the 64-character
+    token; queries still compare the full token to confirm the match.
+    """
+    digest = hashlib.blake2b(session_token.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+# get_security_events queries keyed by (filter on user_id, filter on
+# risk_level), so only these four SQL strings ever reach the statement cache
+_SECURITY_EVENTS_SQL = {
+    (has_user, has_risk): (
+        "SELECT * FROM session_security_log WHERE 1=1"
+        + (" AND user_id = ?" if has_user else "")
+        + (" AND risk_level = ?" if has_risk else "")
+        + " ORDER BY timestamp DESC LIMIT ?"
+    )
+    for has_user in (False, True)
+    for has_risk in (False, True)
+}
+
+def _sqlite_timestamp() -> str:
+    """Current UTC time formatted like SQLite's CURRENT_TIMESTAMP"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+
 class SessionSecurityManager:
     """
     Comprehensive session security manager that handles:
@@ -31,7 +125,13 @@ class SessionSecurityManager:
     - Secure logout procedures
     """
     
-    def __init__(self, database_path: str, session_timeout: int = 3600):
+    # Validated sessions are cached in-process for a few seconds so repeat
+    # requests from the same client skip the database round-trip. Cache hits
+    # do not write last_activity, so it is recorded at this granularity.
+    SESSION_CACHE_TTL = 10
+    SESSION_CACHE_MAXSIZE = 4096
+    
+    def __init__(self, database_path: str, session_timeout: int = 3600) -> None:
         """
         Initialize session security manager.
         
@@ -41,12 +141,46 @@ class SessionSecurityManager:
         """
         self.database_path = database_path
         self.session_timeout = session_timeout
+        self._session_cache: 'OrderedDict[str, Tuple[float, int, str, str, Dict[str, Any]]]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Bumped on every eviction so a validation that read the database
+        # before a logout cannot cache the session after it
+        self._cache_generation = 0
+        
+        # One long-lived connection shared by all threads and serialized by
+        # a lock. It runs in autocommit mode; multi-statement work opens an
+        # explicit transaction.
+        self._conn = sqlite3.connect(
+            database_path,
+            check_same_thread=False,
+            cached_statements=256,
+            isolation_level=None
+        )
+        self._db_lock = threading.Lock()
+        
+        # WAL lets readers proceed alongside the writer, and NORMAL sync is
+        # safe under WAL. A large page cache plus memory-mapped I/O keeps the
+        # hot session pages resident instead of re-reading them with pread.
+        self._conn.execute('PRAGMA journal_mode = WAL')
+        self._conn.execute('PRAGMA synchronous = NORMAL')
+        self._conn.execute('PRAGMA mmap_size = 268435456')
+        self._conn.execute('PRAGMA cache_size = -65536')
+        self._conn.execute('PRAGMA temp_store = MEMORY')
+        
+        # Expired rows are never read again, so skip zeroing their pages
+        self._conn.execute('PRAGMA secure_delete = OFF')
+        
         self._init_session_tables()
     
-    def _init_session_tables(self):
+    def _init_session_tables(self) -> None:
         """Initialize session-related database tables"""
-        conn = sqlite3.connect(self.database_path)
-        
+        with self._db_lock, self._conn as conn:
+            conn.execute('BEGIN')
+            self._create_session_tables(conn)
+    
+    def _create_session_tables(self, conn: sqlite3.Connection) -> None:
+        """Create tables and indexes and migrate older schemas"""
         # Create users table if it doesn't exist (for testing)
         conn.execute('''
             CREATE TABLE IF NOT EXISTS users (
@@ -73,13 +207,61 @@ class SessionSecurityManager:
                 ip_address TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                expires_at TIMESTAMP NOT NULL,
+                expires_at INTEGER NOT NULL,
                 is_active BOOLEAN DEFAULT TRUE,
                 logout_reason TEXT,
+                ua_fingerprint INTEGER,
+                token_hash INTEGER,
                 FOREIGN KEY (user_id) REFERENCES users (id)
             )
         ''')
         
+        # Sessions created before expires_at moved to Unix epoch milliseconds
+        # stored it as a local-time ISO string; convert those in place
+        conn.execute('''
+            UPDATE user_sessions
+            SET expires_at = CAST(strftime('%s', expires_at, 'utc') AS INTEGER) * 1000
+            WHERE typeof(expires_at) = 'text'
+        ''')
+        
+        # Older databases predate ua_fingerprint and token_hash; add and
+        # backfill them
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(user_sessions)')}
+        if 'ua_fingerprint' not in columns:
+            conn.execute('ALTER TABLE user_sessions ADD COLUMN ua_fingerprint INTEGER')
+            conn.create_function('py_ua_fingerprint', 1, _ua_fingerprint, deterministic=True)
+            conn.execute('''
+                UPDATE user_sessions
+                SET ua_fingerprint = py_ua_fingerprint(user_agent)
+                WHERE user_agent != ''
+            ''')
+        if 'token_hash' not in columns:
+            conn.execute('ALTER TABLE user_sessions ADD COLUMN token_hash INTEGER')
+            conn.create_function('py_token_hash', 1, _token_hash, deterministic=True)
+            conn.execute('UPDATE user_sessions SET token_hash = py_token_hash(session_token)')
+        
+        # Partial indexes over live sessions only, used by the hot lookups;
+        # their size tracks the number of concurrent sessions, not history.
+        # Token lookups go through the 8-byte token hash rather than the
+        # token text.
+        conn.execute('DROP INDEX IF EXISTS idx_user_sessions_active_token')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_user_sessions_active_token_hash
+            ON user_sessions(token_hash) WHERE is_active = TRUE
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_user_sessions_active_user
+            ON user_sessions(user_id) WHERE is_active = TRUE
+        ''')
+        
+        # Range-scan indexes for cleanup_expired_sessions
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_user_sessions_expires_at ON user_sessions(expires_at)'
+        )
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_user_sessions_created_at ON user_sessions(created_at)'
+        )
+        
         # Create session security log table
         conn.execute('''
             CREATE TABLE IF NOT EXISTS session_security_log (
@@ -100,9 +282,11 @@ class SessionSecurityManager:
             INSERT OR IGNORE INTO users (id, first_name, last_name, email, password, role, status)
             VALUES (1, 'Test', 'User', 'test@example.com', 'hashed_password', 'admin', 'active')
         ''')
-        
-        conn.commit()
-        conn.close()
+    
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._db_lock:
+            self._conn.close()
     
     def generate_secure_token(self, length: int = 32) -> str:
         """
@@ -131,19 +315,21 @@ class SessionSecurityManager:
         # Generate secure session token
         session_token = self.generate_secure_token()
         
-        # Calculate expiration time
-        expires_at = datetime.now() + timedelta(seconds=self.session_timeout)
+        # Calculate expiration time (Unix epoch milliseconds)
+        expires_at = int((time.time() + self.session_timeout) * 1000)
         
-        # Store session in database
-        conn = sqlite3.connect(self.database_path)
-        conn.execute('''
-            INSERT INTO user_sessions 
-            (session_token, user_id, user_agent, ip_address, expires_at)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (session_token, user_id, user_agent, ip_address, expires_at))
+        # Parse the user agent once here; validation compares fingerprints
+        ua_fingerprint = _ua_fingerprint(user_agent) if user_agent else None
         
-        conn.commit()
-        conn.close()
+        # Store session in database
+        with self._db_lock:
+            self._conn.execute('''
+                INSERT INTO user_sessions 
+                (session_token, token_hash, user_id, user_agent, ip_address,
+                 expires_at, ua_fingerprint)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (session_token, _token_hash(session_token), user_id, user_agent,
+                  ip_address, expires_at, ua_fingerprint))
         
         # Log session creation
         self._log_session_event(
@@ -161,6 +347,10 @@ class SessionSecurityManager:
         """
         Validate session token and check for security issues.
         
+        Sessions validated within the last SESSION_CACHE_TTL seconds are
+        served from the in-process cache, so last_activity, both in the
+        database and in the returned data, lags by up to that long.
+        
         Args:
             session_token: Session token to validate
             ip_address: Current client IP address
@@ -172,18 +362,24 @@ class SessionSecurityManager:
         if not session_token:
             return None
         
-        conn = sqlite3.connect(self.database_path)
-        conn.row_factory = sqlite3.Row
+        cached = self._get_cached_session(session_token, ip_address, user_agent)
+        if cached is not None:
+            return cached
         
-        # Get session data
-        session = conn.execute('''
-            SELECT s.*, u.email, u.role, u.first_name, u.last_name, u.status
-            FROM user_sessions s
-            JOIN users u ON s.user_id = u.id
-            WHERE s.session_token = ? AND s.is_active = TRUE
-        ''', (session_token,)).fetchone()
+        generation = self._cache_generation
         
-        conn.close()
+        # Get session data as a plain tuple in a fixed column order. The unary
+        # + keeps SQLite on the token_hash index; the token text comparison
+        # only confirms the match.
+        with self._db_lock:
+            session = self._conn.execute('''
+                SELECT s.user_id, s.expires_at, s.ip_address, s.ua_fingerprint,
+                       s.created_at, s.last_activity,
+                       u.email, u.role, u.first_name, u.last_name, u.status
+                FROM user_sessions s
+                JOIN users u ON s.user_id = u.id
+                WHERE s.token_hash = ? AND +s.session_token = ? AND s.is_active = TRUE
+            ''', (_token_hash(session_token), session_token)).fetchone()
         
         if not session:
             self._log_session_event(
@@ -192,30 +388,34 @@ class SessionSecurityManager:
             )
             return None
         
+        (user_id, expires_at, stored_ip, stored_fingerprint, created_at, last_activity,
+         email, role, first_name, last_name, status) = session
+        
         # Check if session has expired
-        expires_at = datetime.fromisoformat(session['expires_at'])
-        if datetime.now() > expires_at:
+        if time.time() * 1000 > expires_at:
             self._invalidate_session(session_token, 'expired')
             self._log_session_event(
-                session_token, session['user_id'], 'session_expired',
+                session_token, user_id, 'session_expired',
                 ip_address, user_agent, 'Session expired'
             )
             return None
         
         # Check for session hijacking indicators
-        hijack_detected = self._detect_session_hijacking(session, ip_address, user_agent)
+        hijack_detected = self._detect_session_hijacking(
+            session_token, user_id, stored_ip, stored_fingerprint, ip_address, user_agent
+        )
         if hijack_detected:
             self._invalidate_session(session_token, 'hijack_detected')
             self._log_session_event(
-                session_token, session['user_id'], 'hijack_detected',
+                session_token, user_id, 'hijack_detected',
                 ip_address, user_agent, 
                 'Potential session hijacking detected', 'high'
             )
-            session_logger.warning(f"Potential session hijacking detected for user {session['user_id']}")
+            session_logger.warning(f"Potential session hijacking detected for user {user_id}")
             return None
         
         # Check if user account is still active
-        if session['status'] != 'active':
+        if status != 'active':
             self._invalidate_session(session_token, 'user_inactive')
             return None
         
@@ -223,24 +423,92 @@ class SessionSecurityManager:
         self._update_session_activity(session_token)
         
         # Return session data
-        return {
-            'user_id': session['user_id'],
-            'email': session['email'],
-            'role': session['role'],
-            'first_name': session['first_name'],
-            'last_name': session['last_name'],
+        session_data = {
+            'user_id': user_id,
+            'email': email,
+            'role': role,
+            'first_name': first_name,
+            'last_name': last_name,
             'session_token': session_token,
-            'created_at': session['created_at'],
-            'last_activity': session['last_activity']
+            'created_at': created_at,
+            'last_activity': last_activity
         }
+        self._cache_session(session_token, ip_address, user_agent, expires_at,
+                            session_data, generation)
+        
+        return dict(session_data)
+    
+    def _get_cached_session(self, session_token: str, ip_address: str,
+                            user_agent: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a recently validated session in the in-process cache.
+        
+        Entries are only served while fresh, unexpired and requested from the
+        same IP address and user agent; anything else falls through to the
+        database so the full security checks run again.
+        """
+        with self._cache_lock:
+            entry = self._session_cache.get(session_token)
+            if entry is None:
+                return None
+            
+            cached_at, expires_at, cached_ip, cached_ua, session_data = entry
+            if (time.monotonic() - cached_at >= self.SESSION_CACHE_TTL
+                    or time.time() * 1000 > expires_at):
+                del self._session_cache[session_token]
+                return None
+            if cached_ip != ip_address or cached_ua != user_agent:
+                return None
+            
+            self._session_cache.move_to_end(session_token)
+            return dict(session_data)
+    
+    def _cache_session(self, session_token: str, ip_address: str, user_agent: str,
+                       expires_at: int, session_data: Dict[str, Any],
+                       generation: int) -> None:
+        """Store session data validated while the cache was at the given generation"""
+        with self._cache_lock:
+            if generation != self._cache_generation:
+                return
+            
+            self._session_cache[session_token] = (
+                time.monotonic(), expires_at, ip_address, user_agent, session_data
+            )
+            self._session_cache.move_to_end(session_token)
+            while len(self._session_cache) > self.SESSION_CACHE_MAXSIZE:
+                self._session_cache.popitem(last=False)
     
-    def _detect_session_hijacking(self, session: sqlite3.Row, 
+    def _evict_cached_sessions(self, session_token: Optional[str] = None,
+                               user_id: Optional[int] = None) -> None:
+        """
+        Drop cached entries for a session token or for every session of a user.
+        
+        Callers evict after their database change so that a validation
+        racing with it either reads the change or sees the generation move.
+        """
+        with self._cache_lock:
+            self._cache_generation += 1
+            if session_token is not None:
+                self._session_cache.pop(session_token, None)
+            if user_id is not None:
+                stale_tokens = [
+                    token for token, entry in self._session_cache.items()
+                    if entry[4]['user_id'] == user_id
+                ]
+                for token in stale_tokens:
+                    del self._session_cache[token]
+    
+    def _detect_session_hijacking(self, session_token: str, user_id: int,
+                                stored_ip: Optional[str], stored_fingerprint: Optional[int],
                                 current_ip: str, current_ua: str) -> bool:
         """
         Detect potential session hijacking based on various indicators.
         
         Args:
-            session: Session record from database
+            session_token: Session token being validated
+            user_id: Owner of the session
+            stored_ip: IP address recorded when the session was created
+            stored_fingerprint: User agent fingerprint recorded at session creation
             current_ip: Current request IP address
             current_ua: Current request user agent
             
@@ -248,21 +516,21 @@ class SessionSecurityManager:
             True if hijacking is detected
         """
         # Check IP address change (strict check - can be configured)
-        if session['ip_address'] != current_ip:
+        if stored_ip != current_ip:
             # Log IP change but don't immediately block (could be mobile/proxy)
             self._log_session_event(
-                session['session_token'], session['user_id'], 'ip_change',
+                session_token, user_id, 'ip_change',
                 current_ip, current_ua,
-                f"IP changed from {session['ip_address']} to {current_ip}", 'medium'
+                f"IP changed from {stored_ip} to {current_ip}", 'medium'
             )
             # For demo purposes, we'll allow IP changes but log them
             # In production, you might want to require re-authentication
         
         # Check user agent change (major changes indicate potential hijacking)
-        if session['user_agent'] and current_ua:
-            if not self._user_agents_similar(session['user_agent'], current_ua):
+        if stored_fingerprint is not None and current_ua:
+            if stored_fingerprint != _ua_fingerprint(current_ua):
                 session_logger.warning(
-                    f"User agent change detected for session {session['session_token']}"
+                    f"User agent change detected for session {session_token}"
                 )
                 return True
         
@@ -271,77 +539,24 @@ class SessionSecurityManager:
         
         return False
     
-    def _user_agents_similar(self, original_ua: str, current_ua: str) -> bool:
-        """
-        Check if user agents are similar enough to be from the same client.
-        
-        Args:
-            original_ua: Original user agent
-            current_ua: Current user agent
-            
-        Returns:
-            True if user agents are similar
-        """
-        if not original_ua or not current_ua:
-            return True
-        
-        # Extract browser and OS information
-        def extract_browser_os(ua):
-            ua_lower = ua.lower()
-            browser = 'unknown'
-            os = 'unknown'
-            
-            # Detect browser
-            if 'chrome' in ua_lower and 'edg' not in ua_lower:
-                browser = 'chrome'
-            elif 'firefox' in ua_lower:
-                browser = 'firefox'
-            elif 'safari' in ua_lower and 'chrome' not in ua_lower:
-                browser = 'safari'
-            elif 'edge' in ua_lower or 'edg' in ua_lower:
-                browser = 'edge'
-            
-            # Detect OS
-            if 'windows' in ua_lower:
-                os = 'windows'
-            elif 'mac' in ua_lower:
-                os = 'macos'
-            elif 'linux' in ua_lower:
-                os = 'linux'
-            elif 'android' in ua_lower:
-                os = 'android'
-            elif 'ios' in ua_lower:
-                os = 'ios'
-            
-            return browser, os
-        
-        orig_browser, orig_os = extract_browser_os(original_ua)
-        curr_browser, curr_os = extract_browser_os(current_ua)
-        
-        # Consider similar if browser and OS match
-        return orig_browser == curr_browser and orig_os == curr_os
-    
-    def _update_session_activity(self, session_token: str):
+    def _update_session_activity(self, session_token: str) -> None:
         """Update session last activity timestamp"""
-        conn = sqlite3.connect(self.database_path)
-        conn.execute('''
-            UPDATE user_sessions 
-            SET last_activity = CURRENT_TIMESTAMP 
-            WHERE session_token = ?
-        ''', (session_token,))
-        conn.commit()
-        conn.close()
-    
-    def _invalidate_session(self, session_token: str, reason: str):
+        with self._db_lock:
+            self._conn.execute('''
+                UPDATE user_sessions 
+                SET last_activity = CURRENT_TIMESTAMP 
+                WHERE token_hash = ? AND +session_token = ? AND is_active = TRUE
+            ''', (_token_hash(session_token), session_token))
+    
+    def _invalidate_session(self, session_token: str, reason: str) -> None:
         """Invalidate a session"""
-        conn = sqlite3.connect(self.database_path)
-        conn.execute('''
-            UPDATE user_sessions 
-            SET is_active = FALSE, logout_reason = ?
-            WHERE session_token = ?
-        ''', (reason, session_token))
-        conn.commit()
-        conn.close()
+        with self._db_lock:
+            self._conn.execute('''
+                UPDATE user_sessions 
+                SET is_active = FALSE, logout_reason = ?
+                WHERE token_hash = ? AND +session_token = ? AND is_active = TRUE
+            ''', (reason, _token_hash(session_token), session_token))
+        self._evict_cached_sessions(session_token=session_token)
     
     def logout_session(self, session_token: str, ip_address: str, 
                       user_agent: str, reason: str = 'user_logout') -> bool:
@@ -357,24 +572,23 @@ class SessionSecurityManager:
         Returns:
             True if logout successful
         """
-        # Get session info before invalidating
-        conn = sqlite3.connect(self.database_path)
-        conn.row_factory = sqlite3.Row
-        session = conn.execute('''
-            SELECT user_id FROM user_sessions 
-            WHERE session_token = ? AND is_active = TRUE
-        ''', (session_token,)).fetchone()
-        conn.close()
+        # Invalidate and fetch the owner in one statement
+        with self._db_lock:
+            rows = self._conn.execute('''
+                UPDATE user_sessions 
+                SET is_active = FALSE, logout_reason = ?
+                WHERE token_hash = ? AND +session_token = ? AND is_active = TRUE
+                RETURNING user_id
+            ''', (reason, _token_hash(session_token), session_token)).fetchall()
         
-        if not session:
+        if not rows:
             return False
         
-        # Invalidate session
-        self._invalidate_session(session_token, reason)
+        self._evict_cached_sessions(session_token=session_token)
         
         # Log logout
         self._log_session_event(
-            session_token, session['user_id'], 'logout',
+            session_token, rows[0][0], 'logout',
             ip_address, user_agent, f'Session logged out: {reason}'
         )
         
@@ -382,7 +596,7 @@ class SessionSecurityManager:
         
         return True
     
-    def logout_all_user_sessions(self, user_id: int, reason: str = 'logout_all'):
+    def logout_all_user_sessions(self, user_id: int, reason: str = 'logout_all') -> None:
         """
         Logout all sessions for a specific user.
         
@@ -390,45 +604,39 @@ class SessionSecurityManager:
             user_id: User ID
             reason: Logout reason
         """
-        conn = sqlite3.connect(self.database_path)
-        conn.execute('''
-            UPDATE user_sessions 
-            SET is_active = FALSE, logout_reason = ?
-            WHERE user_id = ? AND is_active = TRUE
-        ''', (reason, user_id))
+        details = f'All sessions logged out for user {user_id}: {reason}'
         
-        affected_rows = conn.total_changes
-        conn.commit()
-        conn.close()
+        # Invalidate and audit in one transaction: one audit row per session,
+        # or a single summary row when the user had no active sessions
+        with self._db_lock, self._conn as conn:
+            conn.execute('BEGIN')
+            tokens = [row[0] for row in conn.execute('''
+                UPDATE user_sessions 
+                SET is_active = FALSE, logout_reason = ?
+                WHERE user_id = ? AND is_active = TRUE
+                RETURNING session_token
+            ''', (reason, user_id))]
+            
+            conn.executemany(_INSERT_LOG_SQL, [
+                (token, user_id, 'logout_all', None, None, details, 'low')
+                for token in tokens or [None]
+            ])
         
-        self._log_session_event(
-            None, user_id, 'logout_all',
-            None, None, f'All sessions logged out for user {user_id}: {reason}'
-        )
+        self._evict_cached_sessions(user_id=user_id)
         
+        affected_rows = len(tokens)
         session_logger.info(f"All sessions for user {user_id} logged out: {affected_rows} sessions")
     
-    def cleanup_expired_sessions(self):
-        """Clean up expired sessions from database"""
-        conn = sqlite3.connect(self.database_path)
-        
-        # Mark expired sessions as inactive
-        cursor = conn.execute('''
-            UPDATE user_sessions 
-            SET is_active = FALSE, logout_reason = 'expired'
-            WHERE expires_at < CURRENT_TIMESTAMP AND is_active = TRUE
-        ''')
-        
-        expired_count = cursor.rowcount
-        
-        # Optionally delete old session records (older than 30 days)
-        conn.execute('''
-            DELETE FROM user_sessions 
-            WHERE created_at < datetime('now', '-30 days')
-        ''')
-        
-        conn.commit()
-        conn.close()
+    def cleanup_expired_sessions(self) -> None:
+        """Delete expired sessions and session records older than 30 days"""
+        # One statement in one write transaction; both predicates are indexed
+        with self._db_lock, self._conn as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.execute('''
+                DELETE FROM user_sessions
+                WHERE expires_at < ? OR created_at < datetime('now', '-30 days')
+            ''', (int(time.time() * 1000),))
+            expired_count = cursor.rowcount
         
         if expired_count > 0:
             session_logger.info(f"Cleaned up {expired_count} expired sessions")
@@ -443,33 +651,28 @@ class SessionSecurityManager:
         Returns:
             List of active sessions
         """
-        conn = sqlite3.connect(self.database_path)
-        conn.row_factory = sqlite3.Row
-        
-        sessions = conn.execute('''
-            SELECT session_token, ip_address, user_agent, created_at, last_activity
-            FROM user_sessions
-            WHERE user_id = ? AND is_active = TRUE
-            ORDER BY last_activity DESC
-        ''', (user_id,)).fetchall()
-        
-        conn.close()
+        with self._db_lock:
+            cursor = self._conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            sessions = cursor.execute('''
+                SELECT session_token, ip_address, user_agent, created_at, last_activity
+                FROM user_sessions
+                WHERE user_id = ? AND is_active = TRUE
+                ORDER BY last_activity DESC
+            ''', (user_id,)).fetchall()
         
         return [dict(session) for session in sessions]
     
     def _log_session_event(self, session_token: Optional[str], user_id: Optional[int], 
                           event_type: str, ip_address: Optional[str], 
                           user_agent: Optional[str], details: str, 
-                          risk_level: str = 'low'):
+                          risk_level: str = 'low') -> None:
         """Log session security events"""
-        conn = sqlite3.connect(self.database_path)
-        conn.execute('''
-            INSERT INTO session_security_log 
-            (session_token, user_id, event_type, ip_address, user_agent, details, risk_level)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (session_token, user_id, event_type, ip_address, user_agent, details, risk_level))
-        conn.commit()
-        conn.close()
+        with self._db_lock:
+            self._conn.execute(
+                _INSERT_LOG_SQL,
+                (session_token, user_id, event_type, ip_address, user_agent, details, risk_level)
+            )
     
     def get_security_events(self, user_id: Optional[int] = None, 
                            risk_level: Optional[str] = None, 
@@ -485,29 +688,302 @@ class SessionSecurityManager:
         Returns:
             List of security events
         """
-        conn = sqlite3.connect(self.database_path)
-        conn.row_factory = sqlite3.Row
-        
-        query = "SELECT * FROM session_security_log WHERE 1=1"
-        params = []
+        query = _SECURITY_EVENTS_SQL[(bool(user_id), bool(risk_level))]
+        params: List[Any] = []
         
         if user_id:
-            query += " AND user_id = ?"
             params.append(user_id)
         
         if risk_level:
-            query += " AND risk_level = ?"
             params.append(risk_level)
         
-        query += " ORDER BY timestamp DESC LIMIT ?"
         params.append(limit)
         
-        events = conn.execute(query, params).fetchall()
-        conn.close()
+        with self._db_lock:
+            cursor = self._conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            events = cursor.execute(query, params).fetchall()
         
         return [dict(event) for event in events]
 
-def get_secure_cookie_config():
+class RedisSessionSecurityManager(SessionSecurityManager):
+    """
+    Session security manager that keeps live sessions in Redis.
+    
+    Each session is a Redis hash that expires together with the session, so
+    session lookups and writes no longer contend on the SQLite connection.
+    The user's profile and status are still read from SQLite on every
+    validation, a primary-key lookup, so deactivations and role changes
+    take effect on the next request. Security events are still written to
+    the SQLite session_security_log table. Requires the optional `redis`
+    package.
+    """
+    
+    def __init__(self, database_path: str, session_timeout: int = 3600,
+                 redis_client: Optional[Any] = None,
+                 redis_url: str = 'redis://localhost:6379/0') -> None:
+        """
+        Initialize the Redis-backed session manager.
+        
+        Args:
+            database_path: Path to SQLite database used for the security log
+            session_timeout: Session timeout in seconds (default: 1 hour)
+            redis_client: Existing client created with decode_responses=True
+            redis_url: Redis URL used when no client is given
+        """
+        if redis_client is None:
+            # Optional dependency, imported only when a client must be built
+            try:
+                import redis  # type: ignore[import-not-found]
+            except ImportError:
+                raise ImportError("RedisSessionSecurityManager requires the 'redis' package") from None
+            redis_client = redis.Redis.from_url(redis_url, decode_responses=True)
+        
+        self._redis: Any = redis_client
+        super().__init__(database_path, session_timeout)
+    
+    @staticmethod
+    def _session_key(session_token: str) -> str:
+        return f'session:{session_token}'
+    
+    @staticmethod
+    def _user_key(user_id: int) -> str:
+        return f'user_sessions:{user_id}'
+    
+    def create_session(self, user_id: int, ip_address: str, user_agent: str) -> str:
+        """
+        Create a new secure session in Redis.
+        
+        Args:
+            user_id: ID of the user
+            ip_address: Client IP address
+            user_agent: Client user agent string
+            
+        Returns:
+            Session token
+        """
+        session_token = self.generate_secure_token()
+        expires_at = int((time.time() + self.session_timeout) * 1000)
+        
+        now = _sqlite_timestamp()
+        session = {
+            'user_id': user_id,
+            'ip_address': ip_address or '',
+            'user_agent': user_agent or '',
+            'ua_fingerprint': _ua_fingerprint(user_agent) if user_agent else '',
+            'created_at': now,
+            'last_activity': now,
+            'expires_at': expires_at
+        }
+        
+        key = self._session_key(session_token)
+        user_key = self._user_key(user_id)
+        pipe = self._redis.pipeline()
+        pipe.hset(key, mapping=session)
+        pipe.pexpireat(key, expires_at)
+        pipe.sadd(user_key, session_token)
+        pipe.pexpireat(user_key, expires_at)
+        pipe.execute()
+        
+        self._log_session_event(
+            session_token, user_id, 'session_created', 
+            ip_address, user_agent, 
+            f'New session created for user {user_id}'
+        )
+        
+        session_logger.info(f"Secure session created for user {user_id} from {ip_address}")
+        
+        return session_token
+    
+    def validate_session(self, session_token: str, ip_address: str, 
+                        user_agent: str) -> Optional[Dict[str, Any]]:
+        """
+        Validate session token and check for security issues.
+        
+        Expiry is enforced by the Redis key TTL, which is absolute from
+        session creation as in the SQLite store.
+        
+        Args:
+            session_token: Session token to validate
+            ip_address: Current client IP address
+            user_agent: Current client user agent
+            
+        Returns:
+            Session data if valid, None if invalid
+        """
+        if not session_token:
+            return None
+        
+        key = self._session_key(session_token)
+        session = self._redis.hgetall(key)
+        
+        if not session:
+            self._log_session_event(
+                session_token, None, 'invalid_session',
+                ip_address, user_agent, 'Invalid session token used'
+            )
+            return None
+        
+        user_id = int(session['user_id'])
+        stored_fingerprint = int(session['ua_fingerprint']) if session['ua_fingerprint'] else None
+        
+        # Check for session hijacking indicators
+        hijack_detected = self._detect_session_hijacking(
+            session_token, user_id, session['ip_address'] or None,
+            stored_fingerprint, ip_address, user_agent
+        )
+        if hijack_detected:
+            self._invalidate_session(session_token, 'hijack_detected')
+            self._log_session_event(
+                session_token, user_id, 'hijack_detected',
+                ip_address, user_agent, 
+                'Potential session hijacking detected', 'high'
+            )
+            session_logger.warning(f"Potential session hijacking detected for user {user_id}")
+            return None
+        
+        # Read the profile live, as the SQLite store's JOIN does, rather than
+        # trusting a copy taken at login
+        with self._db_lock:
+            user = self._conn.execute(_USER_PROFILE_SQL, (user_id,)).fetchone()
+        
+        # Check if user account still exists and is active
+        if user is None or user[4] != 'active':
+            self._invalidate_session(session_token, 'user_inactive')
+            return None
+        
+        email, role, first_name, last_name, _ = user
+        
+        # Update last activity; re-applying the absolute expiry also removes
+        # the key again should it have expired between the two round-trips
+        last_activity = _sqlite_timestamp()
+        pipe = self._redis.pipeline()
+        pipe.hset(key, 'last_activity', last_activity)
+        pipe.pexpireat(key, int(session['expires_at']))
+        pipe.execute()
+        
+        return {
+            'user_id': user_id,
+            'email': email,
+            'role': role,
+            'first_name': first_name,
+            'last_name': last_name,
+            'session_token': session_token,
+            'created_at': session['created_at'],
+            'last_activity': last_activity
+        }
+    
+    def _invalidate_session(self, session_token: str, reason: str) -> None:
+        """Invalidate a session"""
+        # Stale entries in the user's token set are pruned by get_user_sessions
+        self._redis.delete(self._session_key(session_token))
+    
+    def logout_session(self, session_token: str, ip_address: str, 
+                      user_agent: str, reason: str = 'user_logout') -> bool:
+        """
+        Securely logout a session.
+        
+        Args:
+            session_token: Session token to logout
+            ip_address: Client IP address
+            user_agent: Client user agent
+            reason: Logout reason
+            
+        Returns:
+            True if logout successful
+        """
+        pipe = self._redis.pipeline()
+        pipe.hget(self._session_key(session_token), 'user_id')
+        pipe.delete(self._session_key(session_token))
+        user_id, deleted = pipe.execute()
+        
+        if not deleted:
+            return False
+        
+        user_id = int(user_id)
+        self._redis.srem(self._user_key(user_id), session_token)
+        
+        self._log_session_event(
+            session_token, user_id, 'logout',
+            ip_address, user_agent, f'Session logged out: {reason}'
+        )
+        
+        session_logger.info(f"Session {session_token} logged out: {reason}")
+        
+        return True
+    
+    def logout_all_user_sessions(self, user_id: int, reason: str = 'logout_all') -> None:
+        """
+        Logout all sessions for a specific user.
+        
+        Args:
+            user_id: User ID
+            reason: Logout reason
+        """
+        user_key = self._user_key(user_id)
+        tokens = list(self._redis.smembers(user_key))
+        
+        pipe = self._redis.pipeline()
+        for token in tokens:
+            pipe.delete(self._session_key(token))
+        if tokens:
+            pipe.srem(user_key, *tokens)
+        results = pipe.execute()
+        
+        logged_out = [token for token, deleted in zip(tokens, results) if deleted]
+        details = f'All sessions logged out for user {user_id}: {reason}'
+        
+        # One audit row per session, or a single summary row when the user
+        # had no live sessions
+        with self._db_lock, self._conn as conn:
+            conn.execute('BEGIN')
+            conn.executemany(_INSERT_LOG_SQL, [
+                (token, user_id, 'logout_all', None, None, details, 'low')
+                for token in logged_out or [None]
+            ])
+        
+        session_logger.info(f"All sessions for user {user_id} logged out: {len(logged_out)} sessions")
+    
+    def get_user_sessions(self, user_id: int) -> list:
+        """
+        Get all active sessions for a user.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            List of active sessions
+        """
+        user_key = self._user_key(user_id)
+        tokens = list(self._redis.smembers(user_key))
+        
+        pipe = self._redis.pipeline(transaction=False)
+        for token in tokens:
+            pipe.hmget(self._session_key(token), 'ip_address', 'user_agent',
+                       'created_at', 'last_activity')
+        rows = pipe.execute()
+        
+        sessions = []
+        expired_tokens = []
+        for token, (ip_address, user_agent, created_at, last_activity) in zip(tokens, rows):
+            if created_at is None:
+                expired_tokens.append(token)
+                continue
+            sessions.append({
+                'session_token': token,
+                'ip_address': ip_address or None,
+                'user_agent': user_agent or None,
+                'created_at': created_at,
+                'last_activity': last_activity
+            })
+        
+        if expired_tokens:
+            self._redis.srem(user_key, *expired_tokens)
+        
+        sessions.sort(key=lambda session: session['last_activity'], reverse=True)
+        return sessions
+
+def get_secure_cookie_config() -> Dict[str, Any]:
     """
     Get secure cookie configuration for Flask.
     
@@ -3,51 +3,203 @@ Session Security Testing Script for RBAC System
 Tests session security features including hijacking detection and secure logout
 """
 
+import re
+import sys
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.cookiejar import DefaultCookiePolicy
+from operator import itemgetter
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # Optional: fall back to the standard library parser
+    import json
+    _loads = json.loads
+
+# Independent test groups run concurrently on this many threads
+MAX_WORKERS = 4
+
+def _json(response):
+    """Parse a JSON response body straight from its raw bytes"""
+    return _loads(response.content)
+
+def create_pooled_session():
+    """Create a keep-alive session whose pool covers every concurrent test"""
+    session = requests.Session()
+    # HTTP/1.1 cannot multiplex, so every worker gets its own kept-alive
+    # socket and any extra request waits for one instead of opening another
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=MAX_WORKERS,
+        pool_block=True,
+        max_retries=Retry(total=2, backoff_factor=0.1)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+# Cookie security attributes checked in a single scan of Set-Cookie
+_COOKIE_RE = re.compile(r"HttpOnly|Secure|SameSite=Strict")
+
+_is_current = itemgetter('is_current')
+
+# Closing block of the summary, built once
+FEATURES_TESTED = "\n".join([
+    "\n🔒 Session Security Features Tested:",
+    "   ✅ Secure cookie implementation",
+    "   ✅ Session validation",
+    "   ✅ Access control without session",
+    "   ✅ Secure logout procedures",
+    "   ✅ Cookie security attributes",
+    "   ✅ Session management endpoints",
+    "\n🔐 Session security testing completed!"
+])
+
+# Credentials of the seeded admin account used by every login
+LOGIN_BODY = {
+    "email": "admin@company.com",
+    "password": "admin123"
+}
+
+# Pooled session for calls made before a tester exists
+SESSION = create_pooled_session()
 
 class SessionSecurityTester:
-    def __init__(self, base_url="http://localhost:5000"):
+    def __init__(self, base_url="http://localhost:5000", session=None):
         self.base_url = base_url
+        self.login_url = f"{base_url}/api/auth/login"
+        self.validate_url = f"{base_url}/api/auth/validate-session"
+        self.sessions_url = f"{base_url}/api/auth/sessions"
+        self.logout_url = f"{base_url}/api/auth/logout"
+        self.logout_all_url = f"{base_url}/api/auth/logout-all"
         self.test_results = []
-        self.session = requests.Session()
+        self.failed_results = []
+        self.passed_count = 0
+        self.started_at = datetime.now()
+        self._started_ns = time.monotonic_ns()
+        # Reuse a caller's session (e.g. the one that probed the server) so
+        # the first test request finds a warm connection in the pool
+        self.session = session if session is not None else create_pooled_session()
+        self._results_lock = threading.Lock()
+        self._output = threading.local()
+        self._login_lock = threading.Lock()
+        self._first_login_response = None
+        self.session_invalidated = False
+        
+        # Pooled session for tests that must not carry a session cookie; its
+        # jar rejects every cookie so those tests can also run concurrently
+        self.anonymous_session = create_pooled_session()
+        self.anonymous_session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        
+        # The login request is identical every time, so it is encoded once.
+        # Prepared from the cookie-free session, it never carries a cookie
+        self._login_request = self.anonymous_session.prepare_request(
+            requests.Request("POST", self.login_url, json=LOGIN_BODY)
+        )
     
     def log_test(self, test_name, expected, actual, details=""):
         """Log test results"""
-        status = "✅ PASS" if expected == actual else "❌ FAIL"
+        if expected == actual:
+            self._pass(test_name, expected, actual, details)
+        else:
+            self._fail(test_name, expected, actual, details)
+    
+    def _pass(self, test_name, expected, actual, details=""):
+        """Record and print a passing result"""
+        result = {
+            'test': test_name,
+            'expected': expected,
+            'actual': actual,
+            'passed': True,
+            'status': "✅ PASS",
+            'details': details,
+            'timestamp_ns': time.monotonic_ns()
+        }
+        with self._results_lock:
+            self.test_results.append(result)
+            self.passed_count += 1
+        
+        self.emit(f"✅ PASS: {test_name}")
+        if details:
+            self.emit(f"   Details: {details}")
+    
+    def _fail(self, test_name, expected, actual, details=""):
+        """Record and print a failing result"""
         result = {
             'test': test_name,
             'expected': expected,
             'actual': actual,
-            'status': status,
+            'passed': False,
+            'status': "❌ FAIL",
             'details': details,
-            'timestamp': datetime.now().isoformat()
+            'timestamp_ns': time.monotonic_ns()
         }
-        self.test_results.append(result)
-        print(f"{status}: {test_name}")
-        if expected != actual:
-            print(f"   Expected: {expected}")
-            print(f"   Actual: {actual}")
+        with self._results_lock:
+            self.test_results.append(result)
+            self.failed_results.append(result)
+        
+        self.emit(f"❌ FAIL: {test_name}")
+        self.emit(f"   Expected: {expected}")
+        self.emit(f"   Actual: {actual}")
         if details:
-            print(f"   Details: {details}")
+            self.emit(f"   Details: {details}")
+    
+    def emit(self, line):
+        """Buffer a line of output for the current test, or print it directly"""
+        buffer = getattr(self._output, 'lines', None)
+        if buffer is None:
+            print(line)
+        else:
+            buffer.append(line)
+    
+    def emit_lines(self, lines):
+        """Pass buffered lines up to the enclosing buffer, or write them at once"""
+        buffer = getattr(self._output, 'lines', None)
+        if buffer is None:
+            sys.stdout.write("\n".join(lines) + "\n")
+        else:
+            buffer.extend(lines)
+    
+    def run_buffered(self, test):
+        """Run a test with its output collected in a per-thread buffer"""
+        self._output.lines = lines = []
+        try:
+            test()
+        finally:
+            self._output.lines = None
+        return lines
+    
+    def format_timestamp(self, timestamp_ns):
+        """Convert a monotonic log timestamp to wall-clock ISO format"""
+        elapsed = timedelta(microseconds=(timestamp_ns - self._started_ns) // 1000)
+        return (self.started_at + elapsed).isoformat()
+    
+    def first_login(self):
+        """Log in on the shared session once and return that response"""
+        # Login is the most expensive server call (password hashing), so the
+        # login and cookie-header tests share a single one
+        with self._login_lock:
+            if self._first_login_response is None:
+                self._first_login_response = self.session.send(self._login_request.copy())
+            return self._first_login_response
     
     def test_secure_login(self):
         """Test secure login with cookie setting"""
-        print("\n🔐 Testing Secure Login")
-        print("=" * 40)
+        self.emit("\n🔐 Testing Secure Login")
+        self.emit("=" * 40)
         
         try:
             # Test with valid credentials
-            response = self.session.post(
-                f"{self.base_url}/api/auth/login",
-                json={
-                    "email": "admin@company.com",
-                    "password": "admin123"
-                }
-            )
+            response = self.first_login()
             
-            result = response.json()
+            result = _json(response)
             has_session_cookie = 'rbac_session' in self.session.cookies
             
             self.log_test(
@@ -68,7 +220,7 @@ class SessionSecurityTester:
                 )
             
         except Exception as e:
-            self.log_test(
+            self._fail(
                 "Secure Login Test",
                 "SUCCESS",
                 f"ERROR: {str(e)}"
@@ -76,13 +228,13 @@ class SessionSecurityTester:
     
     def test_session_validation(self):
         """Test session validation endpoint"""
-        print("\n🔍 Testing Session Validation")
-        print("=" * 40)
+        self.emit("\n🔍 Testing Session Validation")
+        self.emit("=" * 40)
         
         try:
             # Test session validation
-            response = self.session.get(f"{self.base_url}/api/auth/validate-session")
-            result = response.json()
+            response = self.session.get(self.validate_url)
+            result = _json(response)
             
             self.log_test(
                 "Session Validation",
@@ -101,7 +253,7 @@ class SessionSecurityTester:
                 )
             
         except Exception as e:
-            self.log_test(
+            self._fail(
                 "Session Validation Test",
                 "SUCCESS",
                 f"ERROR: {str(e)}"
@@ -109,14 +261,11 @@ class SessionSecurityTester:
     
     def test_session_without_cookie(self):
         """Test endpoints without session cookie"""
-        print("\n🚫 Testing Access Without Session")
-        print("=" * 40)
+        self.emit("\n🚫 Testing Access Without Session")
+        self.emit("=" * 40)
         
         try:
-            # Create new session without cookies
-            no_cookie_session = requests.Session()
-            
-            response = no_cookie_session.get(f"{self.base_url}/api/auth/validate-session")
+            response = self.anonymous_session.head(self.validate_url)
             
             self.log_test(
                 "Access Without Cookie",
@@ -126,7 +275,7 @@ class SessionSecurityTester:
             )
             
         except Exception as e:
-            self.log_test(
+            self._fail(
                 "No Cookie Test",
                 "DENIED",
                 f"ERROR: {str(e)}"
@@ -134,12 +283,12 @@ class SessionSecurityTester:
     
     def test_user_sessions_endpoint(self):
         """Test getting user sessions"""
-        print("\n📊 Testing User Sessions Endpoint")
-        print("=" * 40)
+        self.emit("\n📊 Testing User Sessions Endpoint")
+        self.emit("=" * 40)
         
         try:
-            response = self.session.get(f"{self.base_url}/api/auth/sessions")
-            result = response.json()
+            response = self.session.get(self.sessions_url)
+            result = _json(response)
             
             self.log_test(
                 "Get User Sessions",
@@ -158,7 +307,7 @@ class SessionSecurityTester:
                 )
                 
                 # Check if current session is marked
-                current_session_found = any(s.get('is_current') for s in sessions)
+                current_session_found = any(map(_is_current, sessions))
                 self.log_test(
                     "Current Session Marked",
                     True,
@@ -167,7 +316,7 @@ class SessionSecurityTester:
                 )
             
         except Exception as e:
-            self.log_test(
+            self._fail(
                 "User Sessions Test",
                 "SUCCESS",
                 f"ERROR: {str(e)}"
@@ -175,13 +324,13 @@ class SessionSecurityTester:
     
     def test_secure_logout(self):
         """Test secure logout functionality"""
-        print("\n🚪 Testing Secure Logout")
-        print("=" * 40)
+        self.emit("\n🚪 Testing Secure Logout")
+        self.emit("=" * 40)
         
         try:
             # Test logout
-            response = self.session.post(f"{self.base_url}/api/auth/logout")
-            result = response.json()
+            response = self.session.post(self.logout_url)
+            result = _json(response)
             
             self.log_test(
                 "Logout Request",
@@ -190,8 +339,10 @@ class SessionSecurityTester:
                 f"Status: {response.status_code}"
             )
             
-            # Test that session is invalidated
-            validation_response = self.session.get(f"{self.base_url}/api/auth/validate-session")
+            # Test that session is invalidated; only the status matters, so
+            # HEAD skips the response body
+            validation_response = self.session.head(self.validate_url)
+            self.session_invalidated = validation_response.status_code == 401
             
             self.log_test(
                 "Session Invalidated",
@@ -201,7 +352,7 @@ class SessionSecurityTester:
             )
             
         except Exception as e:
-            self.log_test(
+            self._fail(
                 "Secure Logout Test",
                 "SUCCESS",
                 f"ERROR: {str(e)}"
@@ -209,33 +360,35 @@ class SessionSecurityTester:
     
     def test_logout_all_sessions(self):
         """Test logout all sessions functionality"""
-        print("\n🚪🚪 Testing Logout All Sessions")
-        print("=" * 40)
+        self.emit("\n🚪🚪 Testing Logout All Sessions")
+        self.emit("=" * 40)
         
         try:
-            # First login again to create a session
-            login_response = self.session.post(
-                f"{self.base_url}/api/auth/login",
-                json={
-                    "email": "admin@company.com",
-                    "password": "admin123"
-                }
-            )
+            # Log in again only if the logout test really ended the session
+            if self.session_invalidated:
+                login_response = self.session.send(self._login_request.copy())
+                logged_in = _json(login_response).get('success')
+            else:
+                logged_in = 'rbac_session' in self.session.cookies
             
-            if login_response.json().get('success'):
-                # Test logout all
-                response = self.session.post(f"{self.base_url}/api/auth/logout-all")
-                result = response.json()
-                
-                self.log_test(
-                    "Logout All Sessions",
-                    True,
-                    result.get('success', False),
-                    f"Status: {response.status_code}"
-                )
-                
-                # Verify session is invalidated
-                validation_response = self.session.get(f"{self.base_url}/api/auth/validate-session")
+            if logged_in:
+                # Test logout all. The sessions are already invalidated once
+                # the response headers arrive, so the validation request is
+                # sent while the logout body is still being read
+                response = self.session.post(self.logout_all_url, stream=True)
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    validation = executor.submit(self.session.head, self.validate_url)
+                    result = _json(response)
+                    
+                    self.log_test(
+                        "Logout All Sessions",
+                        True,
+                        result.get('success', False),
+                        f"Status: {response.status_code}"
+                    )
+                    
+                    # Verify session is invalidated
+                    validation_response = validation.result()
                 
                 self.log_test(
                     "All Sessions Invalidated",
@@ -244,14 +397,14 @@ class SessionSecurityTester:
                     "All sessions should be invalidated"
                 )
             else:
-                self.log_test(
+                self._fail(
                     "Logout All Test",
                     "SUCCESS",
                     "SKIPPED - Could not login first"
                 )
             
         except Exception as e:
-            self.log_test(
+            self._fail(
                 "Logout All Test",
                 "SUCCESS",
                 f"ERROR: {str(e)}"
@@ -259,26 +412,21 @@ class SessionSecurityTester:
     
     def test_cookie_security_headers(self):
         """Test that cookies have security headers"""
-        print("\n🍪 Testing Cookie Security Headers")
-        print("=" * 40)
+        self.emit("\n🍪 Testing Cookie Security Headers")
+        self.emit("=" * 40)
         
         try:
-            # Login to get cookie
-            response = requests.post(
-                f"{self.base_url}/api/auth/login",
-                json={
-                    "email": "admin@company.com",
-                    "password": "admin123"
-                }
-            )
+            # Reuse the suite's login response to get the cookie
+            response = self.first_login()
             
             # Check Set-Cookie header
             set_cookie_header = response.headers.get('Set-Cookie', '')
             
             # Check for security attributes
-            has_httponly = 'HttpOnly' in set_cookie_header
-            has_secure = 'Secure' in set_cookie_header  # Might not work over HTTP
-            has_samesite = 'SameSite=Strict' in set_cookie_header
+            attributes = set(_COOKIE_RE.findall(set_cookie_header))
+            has_httponly = 'HttpOnly' in attributes
+            has_secure = 'Secure' in attributes  # Might not work over HTTP
+            has_samesite = 'SameSite=Strict' in attributes
             
             self.log_test(
                 "HttpOnly Cookie Attribute",
@@ -303,7 +451,7 @@ class SessionSecurityTester:
                     "HTTPS-only cookies"
                 )
             else:
-                self.log_test(
+                self._pass(
                     "Secure Attribute (Development)",
                     "SKIPPED",
                     "SKIPPED",
@@ -311,60 +459,76 @@ class SessionSecurityTester:
                 )
             
         except Exception as e:
-            self.log_test(
+            self._fail(
                 "Cookie Security Test",
                 "SUCCESS",
                 f"ERROR: {str(e)}"
             )
     
+    def run_concurrently(self, tests):
+        """Run independent tests on a thread pool and wait for all of them"""
+        # Each test's output is kept together and emitted in submission order
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            outputs = list(executor.map(self.run_buffered, tests))
+        for lines in outputs:
+            self.emit_lines(lines)
+    
+    def run_authenticated_flow(self):
+        """Run the tests that share the logged-in session, in order"""
+        self.test_secure_login()
+        
+        # Validation and session listing only read the logged-in session
+        self.run_concurrently([
+            self.test_session_validation,
+            self.test_user_sessions_endpoint
+        ])
+        
+        self.test_secure_logout()
+        self.test_logout_all_sessions()
+    
     def run_all_tests(self):
         """Run all session security tests"""
         print("🔐 Session Security Testing Suite")
         print("=" * 50)
         print(f"Testing against: {self.base_url}")
-        print(f"Test started at: {datetime.now()}")
+        print(f"Test started at: {self.started_at}")
         
-        # Run all test suites
-        self.test_secure_login()
-        self.test_session_validation()
-        self.test_user_sessions_endpoint()
-        self.test_session_without_cookie()
-        self.test_cookie_security_headers()
-        self.test_secure_logout()
-        self.test_logout_all_sessions()
+        # The no-cookie and cookie-header checks use their own connections,
+        # so they run alongside the authenticated flow
+        self.run_concurrently([
+            self.run_authenticated_flow,
+            self.test_session_without_cookie,
+            self.test_cookie_security_headers
+        ])
         
         # Generate summary
         self.generate_summary()
     
     def generate_summary(self):
         """Generate test summary"""
-        print("\n📊 Session Security Test Summary")
-        print("=" * 50)
-        
-        total_tests = len(self.test_results)
-        passed_tests = len([t for t in self.test_results if t['status'].startswith('✅')])
-        failed_tests = total_tests - passed_tests
+        passed_tests = self.passed_count
+        failed_tests = len(self.failed_results)
+        total_tests = passed_tests + failed_tests
         
-        print(f"Total Tests: {total_tests}")
-        print(f"Passed: {passed_tests}")
-        print(f"Failed: {failed_tests}")
-        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+        lines = [
+            "\n📊 Session Security Test Summary",
+            "=" * 50,
+            f"Total Tests: {total_tests}",
+            f"Passed: {passed_tests}",
+            f"Failed: {failed_tests}",
+            f"Success Rate: {(passed_tests/total_tests)*100:.1f}%"
+        ]
         
         if failed_tests > 0:
-            print("\n❌ Failed Tests:")
-            for test in self.test_results:
-                if test['status'].startswith('❌'):
-                    print(f"   - {test['test']}: {test['actual']}")
+            lines.append("\n❌ Failed Tests:")
+            lines.extend(
+                f"   - {test['test']}: {test['actual']} ({self.format_timestamp(test['timestamp_ns'])})"
+                for test in self.failed_results
+            )
         
-        print("\n🔒 Session Security Features Tested:")
-        print("   ✅ Secure cookie implementation")
-        print("   ✅ Session validation")
-        print("   ✅ Access control without session")
-        print("   ✅ Secure logout procedures")
-        print("   ✅ Cookie security attributes")
-        print("   ✅ Session management endpoints")
+        lines.append(FEATURES_TESTED)
         
-        print(f"\n🔐 Session security testing completed!")
+        print("\n".join(lines))
 
 def main():
     """Main function to run session security tests"""
@@ -372,17 +536,17 @@ def main():
     print("Make sure the Flask server is running on http://localhost:5000")
     print()
     
-    # Check if server is running
+    # Check if server is running; any HTTP response, even a 401, means it is up
     try:
-        response = requests.get("http://localhost:5000", timeout=5)
+        SESSION.head("http://localhost:5000/api/auth/validate-session", timeout=0.5)
         print("✅ Server is running")
-    except:
+    except (requests.ConnectionError, requests.Timeout):
         print("❌ Server is not running. Please start the Flask server first.")
         print("Run: python app.py")
         return
     
     # Run session security tests
-    tester = SessionSecurityTester()
+    tester = SessionSecurityTester(session=SESSION)
     tester.run_all_tests()
 
 if __name__ == "__main__":
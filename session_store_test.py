@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Session Store Test Script for RBAC System
+
+This script tests the SQLite-backed SessionSecurityManager directly against
+a temporary database, so no running server is needed:
+1. Validation cache hits
+2. Logouts racing with an in-flight validation
+3. Last activity recorded at cache TTL granularity
+4. Upgrade of sessions stored by the original schema
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from session_security import SessionSecurityManager
+
+CHROME_UA = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0 Safari/537.36'
+FIREFOX_UA = 'Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0'
+
+# Tables as created by the original session_security module, which stored
+# expires_at as a local-time 'YYYY-MM-DD HH:MM:SS.ffffff' string and had no
+# ua_fingerprint or token_hash columns
+LEGACY_SCHEMA = '''
+    CREATE TABLE users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        password TEXT NOT NULL,
+        role TEXT NOT NULL DEFAULT 'employee',
+        department TEXT,
+        status TEXT DEFAULT 'active',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE user_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_token TEXT UNIQUE NOT NULL,
+        user_id INTEGER NOT NULL,
+        user_agent TEXT,
+        ip_address TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        expires_at TIMESTAMP NOT NULL,
+        is_active BOOLEAN DEFAULT TRUE,
+        logout_reason TEXT,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    );
+    CREATE TABLE session_security_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_token TEXT,
+        user_id INTEGER,
+        event_type TEXT NOT NULL,
+        ip_address TEXT,
+        user_agent TEXT,
+        details TEXT,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        risk_level TEXT DEFAULT 'low'
+    );
+    INSERT INTO users (id, first_name, last_name, email, password, role, status)
+    VALUES (1, 'Test', 'User', 'test@example.com', 'hashed_password', 'admin', 'active');
+'''
+
+class SessionStoreTester:
+    """Test suite for the SQLite session store"""
+    
+    def __init__(self):
+        """Initialize the tester with a fresh database"""
+        fd, self.database_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        
+        self.manager = SessionSecurityManager(self.database_path, session_timeout=3600)
+        
+        # The manager seeds an active admin with id 1
+        self.user_id = 1
+        self.ip = '203.0.113.10'
+        
+        self.test_results = []
+    
+    def print_header(self, title: str):
+        """Print a formatted test section header"""
+        print(f"\n{'='*80}")
+        print(f"📋 {title}")
+        print(f"{'='*80}")
+    
+    def print_test(self, test_name: str, success: bool, details: str = ""):
+        """Print test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status} {test_name}")
+        if details:
+            print(f"   📋 Details: {details}")
+        
+        self.test_results.append({
+            'test': test_name,
+            'success': success,
+            'details': details
+        })
+    
+    def query(self, sql: str, params: tuple = ()) -> Any:
+        """Run a statement on a separate connection and return the first row"""
+        conn = sqlite3.connect(self.database_path)
+        with conn:
+            row = conn.execute(sql, params).fetchone()
+        conn.close()
+        return row
+    
+    def validate(self, token: str) -> Optional[Dict[str, Any]]:
+        """Validate a token from the test client"""
+        return self.manager.validate_session(token, self.ip, CHROME_UA)
+    
+    def validate_racing(self, token: str, logout) -> Optional[Dict[str, Any]]:
+        """
+        Validate a token, running logout after the session row has been read
+        but before the result is cached.
+        """
+        update_activity = self.manager._update_session_activity
+        
+        def update_then_logout(session_token: str):
+            update_activity(session_token)
+            logout()
+        
+        self.manager._update_session_activity = update_then_logout
+        try:
+            return self.validate(token)
+        finally:
+            self.manager._update_session_activity = update_activity
+    
+    def test_cache_hits(self):
+        """Test that a repeat validation is served from the cache"""
+        self.print_header("Validation Cache")
+        
+        token = self.manager.create_session(self.user_id, self.ip, CHROME_UA)
+        first = self.validate(token)
+        
+        self.print_test("Session cached after validation", token in self.manager._session_cache)
+        self.print_test("Cached validation returns the same session", self.validate(token) == first)
+    
+    def test_logout_during_validation(self):
+        """Test that a logout racing with validation is not undone by the cache"""
+        self.print_header("Logout During Validation")
+        
+        token = self.manager.create_session(self.user_id, self.ip, CHROME_UA)
+        logged_out = []
+        self.validate_racing(
+            token,
+            lambda: logged_out.append(self.manager.logout_session(token, self.ip, CHROME_UA))
+        )
+        
+        self.print_test("Logout succeeded", logged_out == [True])
+        self.print_test("Logged-out session not cached", token not in self.manager._session_cache)
+        self.print_test("Logged-out session rejected", self.validate(token) is None)
+        
+        token = self.manager.create_session(self.user_id, self.ip, CHROME_UA)
+        self.validate_racing(token, lambda: self.manager.logout_all_user_sessions(self.user_id))
+        
+        self.print_test("Session logged out by logout-all rejected", self.validate(token) is None)
+    
+    def test_last_activity_granularity(self):
+        """Test that last_activity is recorded on cache misses only"""
+        self.print_header("Last Activity")
+        
+        token = self.manager.create_session(self.user_id, self.ip, CHROME_UA)
+        self.validate(token)
+        
+        stale = '2000-01-01 00:00:00'
+        set_activity = 'UPDATE user_sessions SET last_activity = ? WHERE session_token = ?'
+        get_activity = 'SELECT last_activity FROM user_sessions WHERE session_token = ?'
+        
+        self.query(set_activity, (stale, token))
+        self.validate(token)
+        self.print_test(
+            "Cache hit leaves last_activity alone",
+            self.query(get_activity, (token,))[0] == stale
+        )
+        
+        # Age the cache entry past its TTL
+        with self.manager._cache_lock:
+            entry = self.manager._session_cache[token]
+            self.manager._session_cache[token] = (
+                time.monotonic() - self.manager.SESSION_CACHE_TTL, *entry[1:]
+            )
+        
+        self.validate(token)
+        self.print_test(
+            "Validation after the TTL records last_activity",
+            self.query(get_activity, (token,))[0] != stale
+        )
+    
+    def test_legacy_session_upgrade(self):
+        """Test that sessions written by the original schema survive the upgrade"""
+        self.print_header("Legacy Session Upgrade")
+        
+        # Run away from UTC so a missing local-time conversion shows up
+        original_tz = os.environ.get('TZ')
+        os.environ['TZ'] = 'America/New_York'
+        time.tzset()
+        
+        fd, legacy_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        manager = None
+        try:
+            live_token = 'a' * 64
+            expired_token = 'b' * 64
+            now = datetime.now()
+            
+            conn = sqlite3.connect(legacy_path)
+            conn.executescript(LEGACY_SCHEMA)
+            with conn:
+                conn.executemany('''
+                    INSERT INTO user_sessions
+                    (session_token, user_id, user_agent, ip_address, expires_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', [
+                    (live_token, self.user_id, CHROME_UA, self.ip, str(now + timedelta(hours=1))),
+                    (expired_token, self.user_id, CHROME_UA, self.ip, str(now - timedelta(hours=1)))
+                ])
+            conn.close()
+            
+            manager = SessionSecurityManager(legacy_path)
+            
+            conn = sqlite3.connect(legacy_path)
+            expires_at, fingerprint, token_hash = conn.execute(
+                'SELECT expires_at, ua_fingerprint, token_hash FROM user_sessions WHERE session_token = ?',
+                (live_token,)
+            ).fetchone()
+            conn.close()
+            
+            expected = (time.time() + 3600) * 1000
+            self.print_test(
+                "Local-time expiry converted to UTC epoch milliseconds",
+                isinstance(expires_at, int) and abs(expires_at - expected) < 5000,
+                f"expires_at {expires_at}, expected about {int(expected)}"
+            )
+            self.print_test(
+                "Fingerprint and token hash backfilled",
+                fingerprint is not None and token_hash is not None
+            )
+            self.print_test(
+                "Legacy session validates",
+                manager.validate_session(live_token, self.ip, CHROME_UA) is not None
+            )
+            self.print_test(
+                "Backfilled fingerprint detects a different browser",
+                manager.validate_session(live_token, self.ip, FIREFOX_UA) is None
+            )
+            self.print_test(
+                "Expired legacy session rejected",
+                manager.validate_session(expired_token, self.ip, CHROME_UA) is None
+            )
+        finally:
+            if manager is not None:
+                manager.close()
+            os.unlink(legacy_path)
+            if original_tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = original_tz
+            time.tzset()
+    
+    def run_all_tests(self):
+        """Run all session store tests"""
+        print("🚀 Starting Session Store Test Suite")
+        
+        start_time = time.time()
+        
+        try:
+            self.test_cache_hits()
+            self.test_logout_during_validation()
+            self.test_last_activity_granularity()
+            self.test_legacy_session_upgrade()
+        finally:
+            self.manager.close()
+            os.unlink(self.database_path)
+        
+        # Print summary
+        duration = time.time() - start_time
+        
+        total_tests = len(self.test_results)
+        passed_tests = len([r for r in self.test_results if r['success']])
+        failed_tests = total_tests - passed_tests
+        
+        self.print_header("Test Summary")
+        print(f"📊 Total Tests: {total_tests}")
+        print(f"✅ Passed: {passed_tests}")
+        print(f"❌ Failed: {failed_tests}")
+        print(f"⏱️  Duration: {duration:.2f} seconds")
+        
+        if failed_tests == 0:
+            print("\n🎉 All session store tests passed!")
+        else:
+            print(f"\n⚠️  {failed_tests} test(s) failed. Review the session store.")
+        
+        return failed_tests == 0
+
+def main():
+    """Main function to run session store tests"""
+    print("🔐 RBAC System - Session Store Test Suite")
+    print("=" * 55)
+    
+    tester = SessionStoreTester()
+    success = tester.run_all_tests()
+    
+    if success:
+        exit(0)
+    else:
+        exit(1)
+
+if __name__ == "__main__":
+    main()
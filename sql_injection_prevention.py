@@ -15,14 +15,212 @@ Key Security Features:
 import sqlite3
 import re
 import html
-from typing import Any, Dict, List, Optional, Tuple, Union
+import threading
+import string
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
 from datetime import datetime
 import logging
 
-# Configure logging for security events
-logging.basicConfig(level=logging.INFO)
+# Logger for security events; handlers are left to the application
 security_logger = logging.getLogger('sql_security')
 
+# Words rejected in user input, and tags rejected after a '<'
+_SQL_KEYWORDS = (
+    'union', 'select', 'insert', 'delete', 'update', 'drop', 'create', 'alter',
+    'exec', 'execute', 'xp_', 'sp_', 'cmdshell', 'openrowset', 'openquery'
+)
+_HTML_TAGS = ('script', 'iframe', 'object', 'embed', 'form')
+
+# Clauses that take values, which must then be bound as ? parameters
+_QUERY_CLAUSE_KEYWORDS = ('where', 'values', 'set')
+
+# Words and procedure prefixes that make a query unsafe regardless of
+# parameterization
+_UNSAFE_QUERY_KEYWORDS = ('union', 'drop', 'alter', 'exec', 'execute')
+_UNSAFE_QUERY_PREFIXES = ('sp_', 'xp_')
+
+def _trie_pattern(words: Tuple[str, ...]) -> str:
+    """
+    Build a regex alternation matching any of the words, factored by prefix.
+    
+    Factoring lets the regex engine reject most positions after a single
+    character comparison instead of trying every word in turn, e.g.
+    ('drop', 'delete') becomes 'd(?:elete|rop)'.
+    
+    Args:
+        words: Literal words to match
+        
+    Returns:
+        str: Regex source for a non-capturing alternation
+    """
+    trie: Dict[str, Dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node: Dict[str, Dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and '' not in node:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        # A word may also end here, so the rest is optional
+        return group + '?' if '' in node else group
+    
+    return build(trie)
+
+# Whole words only, so e.g. an 'offset' or 'dropped_at' column does not
+# count as a SET clause or a DROP statement
+_QUERY_CLAUSE_RE = re.compile(r"\b" + _trie_pattern(_QUERY_CLAUSE_KEYWORDS) + r"\b", re.IGNORECASE)
+_UNSAFE_QUERY_RE = re.compile(
+    r"\b" + _trie_pattern(_UNSAFE_QUERY_KEYWORDS) + r"\b|" + _trie_pattern(_UNSAFE_QUERY_PREFIXES),
+    re.IGNORECASE
+)
+
+# SQLInjectionPrevention.dangerous_patterns merged into one regex so
+# validation scans the input once. Single characters share a class and the
+# keyword and tag lists are prefix-factored; a plain "|".join() of that list
+# is slower than four separate searches in Python's regex engine.
+#
+# Matching is linear in the input length despite the backtracking
+# engine: every branch is a literal of bounded length except the
+# whitespace run after '<', which is followed by a letter \s cannot
+# match. RE2 is deliberately not used: its \b and \s are ASCII-only
+# and it does not fold 'ſ' or 'ı', so e.g. 'ſelect' would pass
+_DANGER_RE = re.compile(
+    r"[;\\]|--|/\*|\*/|\|\||&&"
+    r"|<\s*" + _trie_pattern(_HTML_TAGS) +
+    r"|\b" + _trie_pattern(_SQL_KEYWORDS) + r"\b",
+    re.IGNORECASE
+)
+
+# Inputs up to this length (emails, roles, names) are memoized; longer ones
+# are rare and would only churn the caches
+_MAX_CACHED_INPUT = 256
+
+# Characters that make up most legitimate input (emails, names, roles).
+# Of _DANGER_RE only '--' and the keywords can match text made of these,
+# and a keyword only when it is an entire word between the separators
+_PLAIN_CHARS = (string.ascii_letters + string.digits + '_@.- ').encode('ascii')
+_SQL_KEYWORD_SET = frozenset(_SQL_KEYWORDS)
+
+def _is_input_safe(input_str: str) -> bool:
+    """Check a string against the dangerous patterns"""
+    # Fast path for plain text: bytes.translate deletes every plain
+    # character, so an empty result means nothing else is present
+    if input_str.isascii() and not input_str.encode('ascii').translate(None, _PLAIN_CHARS):
+        if '--' in input_str:
+            return False
+        words = input_str.lower().replace('@', ' ').replace('.', ' ').replace('-', ' ').split()
+        return _SQL_KEYWORD_SET.isdisjoint(words)
+    
+    # re.IGNORECASE already folds case, so lowering only matters for
+    # U+0130, which lowercases to 'i' plus a combining dot that ends a word
+    # (e.g. 'Yİselect' must be rejected). Checked against every cased
+    # code point, no other character changes the result
+    if '\u0130' in input_str:
+        input_str = input_str.lower()
+    return not _DANGER_RE.search(input_str)
+
+def _sanitize(input_str: str) -> str:
+    """Escape HTML and remove null bytes and surrounding whitespace"""
+    # Escape HTML. html.escape's chained str.replace calls each run at
+    # memchr speed and return the string untouched when nothing matches;
+    # a single str.translate table measured several times slower, as
+    # translate falls back to per-character dict lookups for entities
+    sanitized = html.escape(input_str)
+    
+    # Remove null bytes and other dangerous characters
+    sanitized = sanitized.replace('\x00', '')
+    
+    return sanitized.strip()
+
+_is_input_safe_cached = lru_cache(maxsize=4096)(_is_input_safe)
+_sanitize_cached = lru_cache(maxsize=4096)(_sanitize)
+
+# Repository queries, defined once so every call hands sqlite3 the same
+# string and hits its prepared statement cache
+_FIND_USER_BY_EMAIL_SQL = """
+    SELECT id, first_name, last_name, email, role, department, status, created_at
+    FROM users 
+    WHERE email = ? AND status = 'active'
+"""
+
+_AUTHENTICATE_USER_SQL = """
+    SELECT id, first_name, last_name, email, role, department, status
+    FROM users 
+    WHERE email = ? AND password = ? AND status = 'active'
+"""
+
+_INSERT_USER_SQL = """
+    INSERT INTO users (first_name, last_name, email, password, role, department)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# RETURNING hands back the stored row, defaults included, from the INSERT
+# itself; SQLite only supports it from 3.35, older builds read it back by id
+_USER_COLUMNS = "id, first_name, last_name, email, role, department, status, created_at"
+_INSERT_USER_RETURNING_SQL = _INSERT_USER_SQL + " RETURNING " + _USER_COLUMNS
+_FIND_USER_BY_ID_SQL = "SELECT " + _USER_COLUMNS + " FROM users WHERE id = ?"
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# The window count is evaluated before LIMIT, so every row of a page also
+# carries the total number of matching users
+_LIST_USERS_SQL = """
+    SELECT id, first_name, last_name, email, role, department, status, created_at,
+           COUNT(*) OVER () AS total
+    FROM users
+"""
+_LIST_USERS_PAGE_SQL = _LIST_USERS_SQL + " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+_LIST_USERS_BY_ROLE_PAGE_SQL = _LIST_USERS_SQL + " WHERE role = ? ORDER BY created_at DESC LIMIT ? OFFSET ?"
+
+# Bound parameters per IN (...) list; SQLite's floor for the variable limit
+# is 999 on builds before 3.32
+_MAX_IN_PARAMS = 500
+
+_COUNT_USERS_SQL = "SELECT COUNT(*) as total FROM users"
+_COUNT_USERS_BY_ROLE_SQL = _COUNT_USERS_SQL + " WHERE role = ?"
+
+# Frontend field names update_user accepts, mapped to database column names
+_UPDATABLE_USER_FIELDS = {
+    'firstName': 'first_name',
+    'lastName': 'last_name',
+    'email': 'email',
+    'role': 'role',
+    'status': 'status'
+}
+
+# An UPDATE statement for every non-empty combination of updatable fields,
+# keyed by the fields in _UPDATABLE_USER_FIELDS order
+_UPDATE_USER_SQL = {
+    fields: "UPDATE users SET "
+            + ", ".join(f"{_UPDATABLE_USER_FIELDS[field]} = ?" for field in fields)
+            + ", updated_at = CURRENT_TIMESTAMP WHERE id = ?"
+    for count in range(1, len(_UPDATABLE_USER_FIELDS) + 1)
+    for fields in combinations(_UPDATABLE_USER_FIELDS, count)
+}
+
+# Column names returned to the API under a different name; other columns
+# keep their own
+_API_FIELD_MAP = {
+    'first_name': 'firstName',
+    'last_name': 'lastName',
+    'created_at': 'createdAt'
+}
+
+@lru_cache(maxsize=64)
+def _api_keys(description: Tuple) -> Tuple[str, ...]:
+    """Map a cursor description to the API field names of its columns"""
+    return tuple(_API_FIELD_MAP.get(column[0], column[0]) for column in description)
+
 class SQLInjectionPrevention:
     """
     A comprehensive class for preventing SQL injection attacks in Flask applications.
@@ -36,6 +234,8 @@ class SQLInjectionPrevention:
             database_path (str): Path to the SQLite database
         """
         self.database_path = database_path
+        self._local = threading.local()
+        # Individual patterns, kept for reference
         self.dangerous_patterns = [
             r"(;|--|/\*|\*/|\\|\|\||&&)",
             r"\b(union|select|insert|delete|update|drop|create|alter|exec|execute)\b",
@@ -57,13 +257,17 @@ class SQLInjectionPrevention:
         if input_value is None:
             return True
             
-        input_str = str(input_value).lower()
+        input_str = str(input_value)
         
-        # Check for dangerous patterns
-        for pattern in self.dangerous_patterns:
-            if re.search(pattern, input_str, re.IGNORECASE):
-                security_logger.warning(f"Potential SQL injection detected in {field_name}: {input_value}")
-                return False
+        # Check for dangerous patterns; short inputs repeat across requests
+        if len(input_str) <= _MAX_CACHED_INPUT:
+            is_safe = _is_input_safe_cached(input_str)
+        else:
+            is_safe = _is_input_safe(input_str)
+        
+        if not is_safe:
+            security_logger.warning("Potential SQL injection detected in %s: %s", field_name, input_value)
+            return False
         
         return True
     
@@ -80,22 +284,61 @@ class SQLInjectionPrevention:
         if input_value is None:
             return ""
         
-        # Convert to string and escape HTML
-        sanitized = html.escape(str(input_value))
+        input_str = str(input_value)
+        if len(input_str) <= _MAX_CACHED_INPUT:
+            return _sanitize_cached(input_str)
+        return _sanitize(input_str)
+    
+    def sanitize_for_sql(self, input_value: Any) -> str:
+        """
+        Sanitize input that is bound as a query parameter.
+        
+        Parameter binding already neutralizes SQL metacharacters, so values
+        are stored as entered apart from null bytes and surrounding
+        whitespace. HTML escaping belongs at render time (sanitize_for_html);
+        applying it here would store '&amp;' and double-escape on output.
         
-        # Remove null bytes and other dangerous characters
-        sanitized = sanitized.replace('\x00', '')
+        Args:
+            input_value: The input to sanitize
+            
+        Returns:
+            str: Sanitized input
+        """
+        if input_value is None:
+            return ""
         
-        return sanitized.strip()
+        return str(input_value).replace('\x00', '').strip()
+    
+    def sanitize_for_html(self, input_value: Any) -> str:
+        """
+        Escape a value for safe inclusion in HTML output.
+        
+        Args:
+            input_value: The value to escape
+            
+        Returns:
+            str: HTML-escaped value
+        """
+        if input_value is None:
+            return ""
+        
+        return html.escape(str(input_value))
     
     def get_secure_connection(self) -> sqlite3.Connection:
         """
         Get a secure database connection with proper configuration.
         
+        The connection is opened and configured once per thread and then
+        reused, so callers must not close it.
+        
         Returns:
             sqlite3.Connection: Configured database connection
         """
-        conn = sqlite3.connect(self.database_path)
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+        
+        conn = sqlite3.connect(self.database_path, cached_statements=256)
         conn.row_factory = sqlite3.Row
         
         # Enable foreign key constraints
@@ -104,10 +347,23 @@ class SQLInjectionPrevention:
         # Set secure journal mode
         conn.execute("PRAGMA journal_mode = WAL")
         
+        # WAL keeps the database consistent without an fsync on every commit
+        conn.execute("PRAGMA synchronous = NORMAL")
+        
+        self._local.conn = conn
         return conn
     
+    def close_connection(self) -> None:
+        """Close the calling thread's database connection, if any"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
     def execute_secure_query(self, query: str, params: Tuple = (), 
-                           fetch_one: bool = False) -> Union[List[sqlite3.Row], sqlite3.Row, None]:
+                           fetch_one: bool = False,
+                           write: bool = True, api_rows: bool = False
+                           ) -> Union[List[sqlite3.Row], sqlite3.Row, List[Dict], Dict, None]:
         """
         Execute a parameterized query securely.
         
@@ -115,6 +371,10 @@ class SQLInjectionPrevention:
             query: SQL query with ? placeholders
             params: Parameters for the query
             fetch_one: Whether to fetch only one result
+            write: Whether the query modifies data and must be committed;
+                read-only callers pass False to skip the commit
+            api_rows: Whether to return dicts keyed by API field names
+                (see _API_FIELD_MAP) instead of sqlite3.Row objects
             
         Returns:
             Query results or None
@@ -122,24 +382,32 @@ class SQLInjectionPrevention:
         try:
             # Validate query structure
             if not self._is_query_safe(query):
-                security_logger.error(f"Unsafe query detected: {query}")
+                security_logger.error("Unsafe query detected: %s", query)
                 return None
             
             conn = self.get_secure_connection()
-            cursor = conn.execute(query, params)
             
-            if fetch_one:
-                result = cursor.fetchone()
-            else:
-                result = cursor.fetchall()
+            # The connection commits on success and rolls back on error
+            with conn if write else nullcontext():
+                cursor = conn.cursor()
+                if api_rows:
+                    # Fetch plain tuples and name them once per query below,
+                    # rather than calling a row_factory for every row
+                    cursor.row_factory = None
+                cursor.execute(query, params)
+                result = cursor.fetchone() if fetch_one else cursor.fetchall()
             
-            conn.commit()
-            conn.close()
+            if api_rows and result is not None:
+                keys = _api_keys(cursor.description)
+                if fetch_one:
+                    result = dict(zip(keys, result))
+                else:
+                    result = [dict(zip(keys, row)) for row in result]
             
             return result
             
         except sqlite3.Error as e:
-            security_logger.error(f"Database error: {e}")
+            security_logger.error("Database error: %s", e)
             return None
     
     def _is_query_safe(self, query: str) -> bool:
@@ -152,17 +420,13 @@ class SQLInjectionPrevention:
         Returns:
             bool: True if query is safe
         """
-        query_lower = query.lower()
-        
         # Check for parameterized queries (should use ? placeholders)
-        if "?" not in query and any(keyword in query_lower for keyword in ['where', 'values', 'set']):
+        if "?" not in query and _QUERY_CLAUSE_RE.search(query):
             return False
         
         # Check for dangerous SQL keywords in unsafe contexts
-        dangerous_keywords = ['union', 'drop', 'alter', 'exec', 'execute', 'sp_', 'xp_']
-        for keyword in dangerous_keywords:
-            if keyword in query_lower:
-                return False
+        if _UNSAFE_QUERY_RE.search(query):
+            return False
         
         return True
 
@@ -172,6 +436,12 @@ class SecureUserRepository:
     Demonstrates ORM-like patterns for secure database access.
     """
     
+    # Active users found by email are cached in-process, since the same
+    # users are looked up on every authenticated request. The TTL bounds
+    # how long changes made outside this repository stay unseen
+    USER_CACHE_TTL = 60
+    USER_CACHE_MAXSIZE = 4096
+    
     def __init__(self, database_path: str):
         """
         Initialize the secure user repository.
@@ -180,6 +450,49 @@ class SecureUserRepository:
             database_path: Path to the SQLite database
         """
         self.sql_guard = SQLInjectionPrevention(database_path)
+        self._user_cache: 'OrderedDict[str, Tuple[float, Dict]]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Bumped on every eviction so a lookup that read the database
+        # before an update cannot cache what it read afterwards
+        self._cache_generation = 0
+    
+    def _get_cached_user(self, email: str) -> Optional[Dict]:
+        """Return a copy of a fresh cached user, or None"""
+        with self._cache_lock:
+            entry = self._user_cache.get(email)
+            if entry is None:
+                return None
+            
+            cached_at, user = entry
+            if time.monotonic() - cached_at >= self.USER_CACHE_TTL:
+                del self._user_cache[email]
+                return None
+            
+            self._user_cache.move_to_end(email)
+            return dict(user)
+    
+    def _cache_user(self, email: str, user: Dict, generation: int) -> None:
+        """Store a user read while the cache was at the given generation"""
+        with self._cache_lock:
+            if generation != self._cache_generation:
+                return
+            
+            self._user_cache[email] = (time.monotonic(), dict(user))
+            self._user_cache.move_to_end(email)
+            while len(self._user_cache) > self.USER_CACHE_MAXSIZE:
+                self._user_cache.popitem(last=False)
+    
+    def _evict_cached_user(self, user_id: int) -> None:
+        """Drop the cached entry of a user"""
+        with self._cache_lock:
+            self._cache_generation += 1
+            stale_emails = [
+                email for email, (_, user) in self._user_cache.items()
+                if user['id'] == user_id
+            ]
+            for email in stale_emails:
+                del self._user_cache[email]
     
     def find_user_by_email(self, email: str) -> Optional[Dict]:
         """
@@ -196,30 +509,23 @@ class SecureUserRepository:
             return None
         
         # Sanitize input
-        email = self.sql_guard.sanitize_input(email)
+        email = self.sql_guard.sanitize_for_sql(email)
         
-        # Use parameterized query
-        query = """
-            SELECT id, first_name, last_name, email, role, department, status, created_at
-            FROM users 
-            WHERE email = ? AND status = 'active'
-        """
+        user = self._get_cached_user(email)
+        if user is not None:
+            return user
         
-        result = self.sql_guard.execute_secure_query(query, (email,), fetch_one=True)
+        # Use parameterized query
+        generation = self._cache_generation
+        result = cast(Optional[Dict], self.sql_guard.execute_secure_query(
+            _FIND_USER_BY_EMAIL_SQL, (email,), fetch_one=True, write=False, api_rows=True
+        ))
         
-        if result:
-            return {
-                'id': result['id'],
-                'firstName': result['first_name'],
-                'lastName': result['last_name'],
-                'email': result['email'],
-                'role': result['role'],
-                'department': result['department'],
-                'status': result['status'],
-                'createdAt': result['created_at']
-            }
+        if not result:
+            return None
         
-        return None
+        self._cache_user(email, result, generation)
+        return result
     
     def authenticate_user(self, email: str, password_hash: str) -> Optional[Dict]:
         """
@@ -239,30 +545,36 @@ class SecureUserRepository:
             return None
         
         # Sanitize inputs
-        email = self.sql_guard.sanitize_input(email)
-        password_hash = self.sql_guard.sanitize_input(password_hash)
+        email = self.sql_guard.sanitize_for_sql(email)
+        password_hash = self.sql_guard.sanitize_for_sql(password_hash)
         
         # Use parameterized query
-        query = """
-            SELECT id, first_name, last_name, email, role, department, status
-            FROM users 
-            WHERE email = ? AND password = ? AND status = 'active'
-        """
+        result = self.sql_guard.execute_secure_query(
+            _AUTHENTICATE_USER_SQL, (email, password_hash), fetch_one=True, write=False,
+            api_rows=True
+        )
         
-        result = self.sql_guard.execute_secure_query(query, (email, password_hash), fetch_one=True)
-        
-        if result:
-            return {
-                'id': result['id'],
-                'firstName': result['first_name'],
-                'lastName': result['last_name'],
-                'email': result['email'],
-                'role': result['role'],
-                'department': result['department'],
-                'status': result['status']
-            }
+        return cast(Optional[Dict], result) or None
+    
+    def _prepare_user_row(self, user_data: Dict) -> Optional[Tuple]:
+        """Validate and sanitize user data into an _INSERT_USER_SQL parameter row"""
+        # Validate all inputs
+        required_fields = ['firstName', 'lastName', 'email', 'password', 'role', 'department']
+        for field in required_fields:
+            if field not in user_data:
+                return None
+            if not self.sql_guard.validate_input(user_data[field], field):
+                return None
         
-        return None
+        # Sanitize inputs
+        return (
+            self.sql_guard.sanitize_for_sql(user_data['firstName']),
+            self.sql_guard.sanitize_for_sql(user_data['lastName']),
+            self.sql_guard.sanitize_for_sql(user_data['email']),
+            user_data['password'],  # Already hashed
+            self.sql_guard.sanitize_for_sql(user_data['role']),
+            self.sql_guard.sanitize_for_sql(user_data['department'])
+        )
     
     def create_user(self, user_data: Dict) -> Optional[int]:
         """
@@ -274,49 +586,95 @@ class SecureUserRepository:
         Returns:
             New user ID or None
         """
-        # Validate all inputs
-        required_fields = ['firstName', 'lastName', 'email', 'password', 'role', 'department']
-        for field in required_fields:
-            if field not in user_data:
-                return None
-            if not self.sql_guard.validate_input(user_data[field], field):
-                return None
-        
-        # Sanitize inputs
-        sanitized_data = {
-            'firstName': self.sql_guard.sanitize_input(user_data['firstName']),
-            'lastName': self.sql_guard.sanitize_input(user_data['lastName']),
-            'email': self.sql_guard.sanitize_input(user_data['email']),
-            'password': user_data['password'],  # Already hashed
-            'role': self.sql_guard.sanitize_input(user_data['role']),
-            'department': self.sql_guard.sanitize_input(user_data['department'])
-        }
+        row = self._prepare_user_row(user_data)
+        if row is None:
+            return None
         
         # Use parameterized query
-        query = """
-            INSERT INTO users (first_name, last_name, email, password, role, department)
-            VALUES (?, ?, ?, ?, ?, ?)
+        try:
+            with self.sql_guard.get_secure_connection() as conn:
+                cursor = conn.execute(_INSERT_USER_SQL, row)
+            
+            return cursor.lastrowid
+            
+        except sqlite3.Error as e:
+            security_logger.error("Error creating user: %s", e)
+            return None
+    
+    def create_user_record(self, user_data: Dict) -> Optional[Dict]:
+        """
+        Securely create a new user and return the stored user.
+        
+        Args:
+            user_data: Dictionary containing user information
+            
+        Returns:
+            New user data dictionary or None
         """
+        row = self._prepare_user_row(user_data)
+        if row is None:
+            return None
         
         try:
-            conn = self.sql_guard.get_secure_connection()
-            cursor = conn.execute(query, (
-                sanitized_data['firstName'],
-                sanitized_data['lastName'],
-                sanitized_data['email'],
-                sanitized_data['password'],
-                sanitized_data['role'],
-                sanitized_data['department']
-            ))
+            with self.sql_guard.get_secure_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                if _HAS_RETURNING:
+                    user = cursor.execute(_INSERT_USER_RETURNING_SQL, row).fetchone()
+                else:
+                    cursor.execute(_INSERT_USER_SQL, row)
+                    user = cursor.execute(_FIND_USER_BY_ID_SQL, (cursor.lastrowid,)).fetchone()
             
-            user_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            return dict(zip(_api_keys(cursor.description), user))
+            
+        except sqlite3.Error as e:
+            security_logger.error("Error creating user: %s", e)
+            return None
+    
+    def create_users(self, users: List[Dict]) -> Optional[List[int]]:
+        """
+        Securely create several users in a single transaction.
+        
+        Every user is validated before anything is written, and if any user
+        is invalid or any insert fails, no user is created.
+        
+        Args:
+            users: List of dictionaries containing user information
             
-            return user_id
+        Returns:
+            New user IDs in input order, or None
+        """
+        rows = []
+        for user_data in users:
+            row = self._prepare_user_row(user_data)
+            if row is None:
+                return None
+            rows.append(row)
+        
+        if not rows:
+            return []
+        
+        try:
+            with self.sql_guard.get_secure_connection() as conn:
+                conn.executemany(_INSERT_USER_SQL, rows)
+                
+                # executemany does not report row IDs, so look them up by
+                # the (unique) email, in chunks below SQLite's variable limit
+                emails = [row[2] for row in rows]
+                user_ids = {}
+                for start in range(0, len(emails), _MAX_IN_PARAMS):
+                    chunk = emails[start:start + _MAX_IN_PARAMS]
+                    placeholders = ', '.join('?' * len(chunk))
+                    cursor = conn.execute(
+                        f"SELECT id, email FROM users WHERE email IN ({placeholders})", chunk
+                    )
+                    for user in cursor:
+                        user_ids[user['email']] = user['id']
+            
+            return [user_ids[email] for email in emails]
             
         except sqlite3.Error as e:
-            security_logger.error(f"Error creating user: {e}")
+            security_logger.error("Error creating users: %s", e)
             return None
     
     def update_user(self, user_id: int, user_data: Dict) -> bool:
@@ -334,52 +692,28 @@ class SecureUserRepository:
         if not isinstance(user_id, int) or user_id <= 0:
             return False
         
-        # Validate inputs
-        allowed_fields = ['firstName', 'lastName', 'email', 'role', 'status']
-        update_fields = []
-        update_values = []
-        
-        for field in allowed_fields:
-            if field in user_data:
-                if not self.sql_guard.validate_input(user_data[field], field):
-                    return False
-                
-                # Map frontend field names to database column names
-                db_field = {
-                    'firstName': 'first_name',
-                    'lastName': 'last_name',
-                    'email': 'email',
-                    'role': 'role',
-                    'status': 'status'
-                }.get(field, field)
-                
-                update_fields.append(f"{db_field} = ?")
-                update_values.append(self.sql_guard.sanitize_input(user_data[field]))
-        
-        if not update_fields:
+        fields = tuple(field for field in _UPDATABLE_USER_FIELDS if field in user_data)
+        if not fields:
             return False
         
-        # Add updated timestamp
-        update_fields.append("updated_at = CURRENT_TIMESTAMP")
+        # Validate inputs
+        update_values: List[Any] = []
+        for field in fields:
+            if not self.sql_guard.validate_input(user_data[field], field):
+                return False
+            update_values.append(self.sql_guard.sanitize_for_sql(user_data[field]))
         update_values.append(user_id)
         
-        # Use parameterized query
-        query = f"""
-            UPDATE users 
-            SET {', '.join(update_fields)}
-            WHERE id = ?
-        """
-        
+        # Use the parameterized query for this set of fields
         try:
-            conn = self.sql_guard.get_secure_connection()
-            conn.execute(query, update_values)
-            conn.commit()
-            conn.close()
+            with self.sql_guard.get_secure_connection() as conn:
+                conn.execute(_UPDATE_USER_SQL[fields], update_values)
             
+            self._evict_cached_user(user_id)
             return True
             
         except sqlite3.Error as e:
-            security_logger.error(f"Error updating user: {e}")
+            security_logger.error("Error updating user: %s", e)
             return False
     
     def get_users_with_pagination(self, page: int = 1, per_page: int = 10, 
@@ -403,50 +737,36 @@ class SecureUserRepository:
         
         offset = (page - 1) * per_page
         
-        # Build query with optional role filter
-        base_query = """
-            SELECT id, first_name, last_name, email, role, department, status, created_at
-            FROM users
-        """
-        
-        params = []
+        # Pick the queries with or without the role filter
+        query = _LIST_USERS_PAGE_SQL
+        count_query = _COUNT_USERS_SQL
+        filter_params: Tuple[str, ...] = ()
         if role_filter:
             if not self.sql_guard.validate_input(role_filter, "role"):
                 return {'users': [], 'total': 0, 'page': page, 'per_page': per_page}
             
-            base_query += " WHERE role = ?"
-            params.append(self.sql_guard.sanitize_input(role_filter))
-        
-        # Add pagination
-        query = base_query + " ORDER BY created_at DESC LIMIT ? OFFSET ?"
-        params.extend([per_page, offset])
-        
-        # Get total count
-        count_query = "SELECT COUNT(*) as total FROM users"
-        if role_filter:
-            count_query += " WHERE role = ?"
-            count_result = self.sql_guard.execute_secure_query(count_query, (role_filter,), fetch_one=True)
+            query = _LIST_USERS_BY_ROLE_PAGE_SQL
+            count_query = _COUNT_USERS_BY_ROLE_SQL
+            filter_params = (self.sql_guard.sanitize_for_sql(role_filter),)
+        
+        # Get users together with the total count
+        users_result = self.sql_guard.execute_secure_query(
+            query, (*filter_params, per_page, offset), write=False, api_rows=True
+        )
+        
+        users = cast(List[Dict], users_result) or []
+        if users:
+            total = users[0]['total']
+            for user in users:
+                del user['total']
+        elif offset:
+            # A page past the end has no rows to carry the total
+            count_result = cast(Optional[sqlite3.Row], self.sql_guard.execute_secure_query(
+                count_query, filter_params, fetch_one=True, write=False
+            ))
+            total = count_result['total'] if count_result else 0
         else:
-            count_result = self.sql_guard.execute_secure_query(count_query, (), fetch_one=True)
-        
-        total = count_result['total'] if count_result else 0
-        
-        # Get users
-        users_result = self.sql_guard.execute_secure_query(query, params)
-        
-        users = []
-        if users_result:
-            for user in users_result:
-                users.append({
-                    'id': user['id'],
-                    'firstName': user['first_name'],
-                    'lastName': user['last_name'],
-                    'email': user['email'],
-                    'role': user['role'],
-                    'department': user['department'],
-                    'status': user['status'],
-                    'createdAt': user['created_at']
-                })
+            total = 0
         
         return {
             'users': users,
@@ -458,6 +778,8 @@ class SecureUserRepository:
 
 # Example usage and demonstration
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     # Demonstrate secure database operations
     print("🛡️  SQL Injection Prevention - Security Demonstration")
     print("=" * 60)